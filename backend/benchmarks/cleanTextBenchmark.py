@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+usage: python backend/benchmarks/cleanTextBenchmark.py [--rows 100000] [--repeat 3]
+
+Times `clean_text_columns` against the per‑cell `re.sub` it replaced on a
+synthetic issues frame (as built by the extractors and as read back from
+xlsx, where text columns are plain objects) and checks that both produce
+identical frames.
+
+The baseline, and so the reported speedup, is the per‑cell cleaner as it
+was just before vectorizing: it already skipped non‑strings with
+`isinstance(x, str)`.  The original `re.sub(..., str(x)) if pd.notnull(x)`
+turned every non‑null cell into text, so its output differs and it is not
+compared here.
+"""
+
+import argparse
+import re
+import sys
+import time
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "functions"))
+
+from utils.dataCleaning import clean_text_columns
+from utils.storage import frame_from_rows
+
+def legacy_clean_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Per‑cell cleaner with the `isinstance` guard, the baseline of the speedups."""
+    for col in df.select_dtypes(include=["object", "string"]):
+        df[col] = df[col].apply(
+            lambda x: re.sub(r"[^\x20-\x7E]", "", x) if isinstance(x, str) else x
+        )
+    return df
+
+WORDS = ["fix", "bug", "when", "parsing", "dates", "in", "fread", "column", "type", "error"]
+NOISE = ["é", "ü", "—", "\n", "\t", "😀", "→", "\x07"]
+
+def _text(rng: np.random.Generator, words: int, dirty: float) -> str:
+    text = " ".join(rng.choice(WORDS, words))
+    if rng.random() < dirty:
+        pos = rng.integers(0, len(text), 3)
+        for p in sorted(pos, reverse=True):
+            text = text[:p] + rng.choice(NOISE) + text[p:]
+    return text
+
+def synthetic_rows(n: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    t0 = pd.Timestamp("2020-01-01", tz="UTC")
+    rows = []
+    for i in range(n):
+        created = t0 + pd.Timedelta(minutes=int(rng.integers(0, 2_000_000)))
+        rows.append({
+            "number":     i,
+            "id":         10_000_000 + i,
+            "html_url":   f"https://github.com/org/repo/issues/{i}",
+            "title":      _text(rng, 8, 0.05),
+            "body":       _text(rng, 150, 0.6) if rng.random() > 0.1 else None,
+            "created_at": created,
+            "closed_at":  created + pd.Timedelta(days=3) if rng.random() > 0.3 else None,
+            "state":      "closed" if rng.random() > 0.3 else "open",
+            "author":     f"user{rng.integers(0, 5000)}",
+            "labels":     ["bug"] if rng.random() > 0.5 else [],
+            "milestone":  None,
+            "reactions":  {"+1": int(rng.integers(1, 5))} if rng.random() > 0.8 else {},
+        })
+    return rows
+
+def _best_of(fn, frame: pd.DataFrame, repeat: int) -> tuple[float, pd.DataFrame]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        df = frame.copy()
+        start = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark clean_text_columns")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows of the synthetic frame")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    extracted = frame_from_rows(synthetic_rows(args.rows))
+    text_cols = extracted.select_dtypes(include=["object", "string"]).columns
+    from_xlsx = extracted.astype({c: object for c in text_cols})
+
+    for label, frame in (("extracted", extracted), ("object columns", from_xlsx)):
+        legacy_s, expected = _best_of(legacy_clean_text_columns, frame, args.repeat)
+        new_s, actual = _best_of(clean_text_columns, frame, args.repeat)
+
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+        assert actual.dtypes.equals(expected.dtypes)
+        print(f"{label:>15}: {args.rows} rows  legacy {legacy_s:7.3f}s  vectorized {new_s:7.3f}s  "
+              f"speedup ×{legacy_s / new_s:.1f}  (identical ✔︎)")
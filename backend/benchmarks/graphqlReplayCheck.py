@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+usage: python backend/benchmarks/graphqlReplayCheck.py
+       python backend/benchmarks/graphqlReplayCheck.py --record --api_key KEY [--org ORG --repo REPO --items 2]
+
+Replays the GraphQL fixture under `fixtures/graphqlReplay` (no network, no
+token) and checks that `fetch_pull_rows` / `fetch_issue_rows` build the
+datasets the REST extractors build for the same items: the REST rows come
+from the REST responses saved next to it (`rest.json`), turned into PyGithub
+objects and mapped by the extractors' own row functions.  Both sides go
+through `frame_from_rows` and `clean_text_columns`, as on extraction, and
+must have the same columns, in the same order, with the same dtypes.
+
+`--record` re‑records both sides from the live API for the newest `--items`
+pull requests and issues of a repository.
+"""
+
+import argparse
+import json
+import sys
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "functions"))
+
+from github import Github
+from github.Issue import Issue
+from github.IssueComment import IssueComment
+from github.PullRequest import PullRequest
+from github.PullRequestComment import PullRequestComment
+
+from issueExtractor import _issue_comment_row, _issue_row
+from pullRequestExtractor import _pull_row, _review_comment_row
+from utils.dataCleaning import clean_text_columns
+from utils.githubGraphQL import GraphQLTransport, fetch_issue_rows, fetch_pull_rows
+from utils.githubHttp import get_github
+from utils.storage import frame_from_rows
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "graphqlReplay"
+
+def record(api_key: str, org: str, repo: str, items: int, fixtures: Path = FIXTURES) -> None:
+    """Save the GraphQL responses and the REST items of the newest `items` PRs and issues."""
+    fixtures.mkdir(parents=True, exist_ok=True)
+    for old in fixtures.glob("*.json"):
+        old.unlink()
+
+    transport = GraphQLTransport(api_key, fixtures=fixtures, mode="record")
+    fetch_pull_rows(transport, org, repo, 0, items)
+    fetch_issue_rows(transport, org, repo, 0, items)
+
+    gh_repo = get_github(api_key).get_repo(f"{org}/{repo}")
+    pulls = list(gh_repo.get_pulls(state="all")[:items])
+    issues = [i for i in gh_repo.get_issues(state="all") if i.pull_request is None][:items]
+    rest = {
+        "org": org, "repo": repo, "items": items,
+        "pulls": [{"pull": pr.raw_data, "comments": [c.raw_data for c in pr.get_comments()]} for pr in pulls],
+        "issues": [{"issue": i.raw_data, "comments": [c.raw_data for c in i.get_comments()]} for i in issues],
+    }
+    with open(fixtures / "rest.json", "w", encoding="utf-8") as fh:
+        json.dump(rest, fh, indent=1)
+
+def rest_frames(rest: dict) -> dict:
+    """Datasets of the saved REST items, built by the REST extractors' row functions."""
+    gh = Github()
+    pulls, pull_comments, issues, issue_comments = [], [], [], []
+    for item in rest["pulls"]:
+        pr = gh.create_from_raw_data(PullRequest, item["pull"])
+        pulls.append(_pull_row(pr))
+        pull_comments += [_review_comment_row(pr.number, gh.create_from_raw_data(PullRequestComment, c))
+                          for c in item["comments"]]
+    for item in rest["issues"]:
+        issue = gh.create_from_raw_data(Issue, item["issue"])
+        issues.append(_issue_row(issue))
+        issue_comments += [_issue_comment_row(issue.number, gh.create_from_raw_data(IssueComment, c))
+                           for c in item["comments"]]
+    return _frames(pulls, pull_comments, issues, issue_comments)
+
+def replay_frames(rest: dict, fixtures: Path = FIXTURES) -> dict:
+    """Datasets of the same items fetched by the GraphQL backend from the recorded responses."""
+    transport = GraphQLTransport(fixtures=fixtures, mode="replay")
+    pulls, pull_comments = fetch_pull_rows(transport, rest["org"], rest["repo"], 0, rest["items"])
+    issues, issue_comments = fetch_issue_rows(transport, rest["org"], rest["repo"], 0, rest["items"])
+    return _frames(pulls, pull_comments, issues, issue_comments)
+
+def _frames(*rows: list) -> dict:
+    kinds = ("pulls", "pulls_comments", "issues", "issues_comments")
+    return {kind: clean_text_columns(frame_from_rows(r)) for kind, r in zip(kinds, rows)}
+
+def compare(rest: dict, replay: dict) -> list[str]:
+    """Differences in rows, columns or dtypes between the REST and the GraphQL datasets."""
+    problems = []
+    for kind, expected in rest.items():
+        actual = replay[kind]
+        if len(actual) != len(expected):
+            problems.append(f"{kind}: {len(actual)} GraphQL rows, {len(expected)} REST rows")
+        if list(actual.columns) != list(expected.columns):
+            problems.append(f"{kind}: columns {list(actual.columns)} != {list(expected.columns)}")
+            continue
+        for col in expected.columns:
+            if actual[col].dtype != expected[col].dtype:
+                problems.append(f"{kind}.{col}: {actual[col].dtype} != {expected[col].dtype}")
+    return problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the GraphQL backend's rows against the REST rows offline")
+    parser.add_argument("--record", action="store_true", help="Re-record the fixture from the live API first")
+    parser.add_argument("--api_key", help="Github API Key (needed to record)")
+    parser.add_argument("--org", default="Rdatatable", help="Organization to record")
+    parser.add_argument("--repo", default="data.table", help="Repository to record")
+    parser.add_argument("--items", type=int, default=2, help="Newest pull requests and issues to record")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.api_key:
+            parser.error("--record needs --api_key")
+        record(args.api_key, args.org, args.repo, args.items)
+
+    with open(FIXTURES / "rest.json", encoding="utf-8") as fh:
+        rest = json.load(fh)
+    expected, actual = rest_frames(rest), replay_frames(rest)
+
+    for kind, df in actual.items():
+        print(f"{kind:>15}: {len(df)} rows, {len(df.columns)} columns")
+    problems = compare(expected, actual)
+    assert not problems, "GraphQL rows differ from REST rows:\n  " + "\n  ".join(problems)
+    print("GraphQL replay matches the REST rows ✔︎")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+usage: python backend/benchmarks/rateLimitShareCheck.py [--processes 8] [--limit 5000] [--requests 40000]
+
+Simulates N extractor processes that share one token, each with its own
+`RateLimitScheduler(share=1/N)` (as `extractionDriver` configures its
+shards), against a fake GitHub that counts the token's requests, on fake
+clocks (one per process, so nothing sleeps).  Checks that
+
+• together they spend about the full hourly limit in a window, rather than
+  the 1/N a per‑process reading of the token‑wide `x-ratelimit-remaining`
+  header allowed, and
+• an extraction of `--requests` requests split into N equal shards runs at
+  the token's rate, so it finishes no later than in one process (sooner
+  when one process is bound by request latency).
+"""
+
+import argparse
+import heapq
+import sys
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "functions"))
+
+from utils.rateLimit import RateLimitScheduler
+
+WINDOW = 3600.0
+
+class FakeToken:
+    """The token's rate‑limit windows as GitHub reports them."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit, self.remaining, self.reset = limit, limit, WINDOW
+        self.served = [0]                 # requests per window
+
+    def request(self, now: float) -> dict:
+        while now >= self.reset:
+            self.reset += WINDOW
+            self.remaining = self.limit
+            self.served.append(0)
+        self.remaining -= 1
+        if self.remaining < 0:
+            raise RuntimeError("token exhausted before the reset (a request would have got a 403)")
+        self.served[-1] += 1
+        return {"x-ratelimit-limit": str(self.limit), "x-ratelimit-remaining": str(self.remaining),
+                "x-ratelimit-reset": str(self.reset)}
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+def simulate(processes: int, limit: int, requests: int, latency: float) -> tuple[float, list[int]]:
+    """(hours until the last process is done, requests the token served per window)."""
+    token = FakeToken(limit)
+    clocks = [_Clock() for _ in range(processes)]
+    schedulers = [RateLimitScheduler(share=1 / processes, clock=c, sleep=c.sleep) for c in clocks]
+    todo = [requests // processes + (i < requests % processes) for i in range(processes)]
+
+    # always advance the process whose clock is furthest behind
+    ready = [(0.0, i) for i in range(processes) if todo[i]]
+    while ready:
+        _, i = heapq.heappop(ready)
+        schedulers[i].acquire()
+        headers = token.request(clocks[i].now)
+        clocks[i].now += latency
+        schedulers[i].update(headers)
+        todo[i] -= 1
+        if todo[i]:
+            heapq.heappush(ready, (clocks[i].now, i))
+
+    return max(c.now for c in clocks) / 3600, token.served
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that processes sharing a token can spend its whole limit")
+    parser.add_argument("--processes", type=int, default=8, help="Processes (shards) sharing the token")
+    parser.add_argument("--limit", type=int, default=5000, help="Hourly request limit of the token")
+    parser.add_argument("--requests", type=int, default=40_000, help="Requests of the simulated extraction")
+    args = parser.parse_args()
+    reserve = RateLimitScheduler().reserve
+
+    hours = {}
+    for latency in (0.25, 2.0):
+        for n in sorted({1, args.processes}):
+            hours[latency, n], served = simulate(n, args.limit, args.requests, latency)
+            full = served[:-1]            # the last window is cut short by the end of the work
+            print(f"latency {latency:4.2f}s  {n} process(es): done in {hours[latency, n]:5.2f}h, "
+                  f"requests per full window {min(full, default=0)}–{max(full, default=0)} of {args.limit}")
+            # unless latency caps the processes below the limit, everything but the
+            # `reserve` every process keeps back should be spent
+            if n * 3600 / latency >= args.limit:
+                assert all(s >= 0.98 * (args.limit - n * reserve) for s in full), "token under‑used"
+        assert hours[latency, args.processes] <= hours[latency, 1] * 1.02, "sharding slowed the extraction down"
+    print("shared token fully used ✔︎")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+usage: python batchRunner.py [--manifest repositories.json] [--only SLUG ...] [--skip_extraction]
+
+Extracts and processes every repository of a manifest (by default the
+dashboard's `frontend/public/repositories.json`) in one run.
+
+• Extraction is bound by the GitHub API, not the CPU: it runs in threads,
+  at most `--extract_limit` repositories at a time, all of them sharing the
+  token's rate‑limit scheduler and HTTP cache.
+• Processing is CPU bound: as soon as a repository is extracted its
+  `pipeline.run_pipeline` is submitted to a pool of `--processes` worker
+  processes, which all use the same `as_of` moment.
+• A failure in either stage is reported for that repository only; the
+  others carry on, and the run exits non‑zero at the end.
+"""
+
+import argparse
+import json
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from urllib.parse import urlparse
+
+from issueExtractor import extract_issues
+from milestoneExtractor import extract_milestones
+from pipeline import run_pipeline
+from pullRequestExtractor import extract_pulls
+from utils.httpCache import DEFAULT_CACHE_MB, enable_http_cache
+from utils.timeGrid import run_as_of, set_run_as_of
+
+DEFAULT_MANIFEST = Path(__file__).resolve().parents[2] / "frontend" / "public" / "repositories.json"
+
+@dataclass
+class Target:
+    slug: str
+    org: str
+    repo: str
+    timings: dict = field(default_factory=dict)
+    error: str | None = None
+
+def load_manifest(path: Path, only=None) -> list[Target]:
+    """Repositories of the manifest; entries name them with `org` / `repo` or a `github` URL."""
+    with open(path, encoding="utf-8") as fh:
+        entries = json.load(fh)
+
+    targets = []
+    for entry in entries:
+        if "org" in entry and "repo" in entry:
+            org, repo = entry["org"], entry["repo"]
+        else:
+            org, repo = urlparse(entry["github"]).path.strip("/").split("/")[:2]
+        slug = entry.get("slug", f"{org}/{repo}")
+        if only and slug not in only:
+            continue
+        targets.append(Target(slug, org, repo))
+    return targets
+
+def _extract(target: Target, api_key: str, workers: int) -> Target:
+    start = time.perf_counter()
+    extract_issues(target.org, target.repo, api_key, incremental=True)
+    extract_pulls(target.org, target.repo, api_key, incremental=True, workers=workers)
+    extract_milestones(target.org, target.repo, api_key)
+    target.timings["extract"] = time.perf_counter() - start
+    return target
+
+def _init_worker(as_of: datetime) -> None:
+    set_run_as_of(as_of)
+
+def _process(org: str, repo: str) -> float:
+    start = time.perf_counter()
+    run_pipeline(org, repo)
+    return time.perf_counter() - start
+
+def _failure(stage: str, exc: BaseException) -> str:
+    return f"{stage}: {type(exc).__name__}: {exc}"
+
+def run_batch(targets: list[Target], api_key: str | None, extract_limit: int = 2, processes: int | None = None,
+              workers: int = 8, skip_extraction: bool = False) -> list[Target]:
+    """Extract (unless `skip_extraction`) and process every target; failures are recorded on the target."""
+    as_of = run_as_of()
+    pending = {}
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn"),
+                             initializer=_init_worker, initargs=(as_of,)) as pool:
+
+        def submit(target: Target) -> None:
+            pending[pool.submit(_process, target.org, target.repo)] = target
+
+        if skip_extraction:
+            for target in targets:
+                submit(target)
+        else:
+            with ThreadPoolExecutor(max_workers=extract_limit) as extractors:
+                jobs = {extractors.submit(_extract, t, api_key, workers): t for t in targets}
+                for job in as_completed(jobs):
+                    target = jobs[job]
+                    try:
+                        job.result()
+                    except Exception as exc:
+                        target.error = _failure("extraction", exc)
+                        print(f"✘ {target.slug}: {target.error}")
+                        continue
+                    print(f"✔ extracted {target.slug} in {target.timings['extract']:.1f}s")
+                    submit(target)
+
+        for job in as_completed(pending):
+            target = pending[job]
+            try:
+                target.timings["process"] = job.result()
+            except Exception as exc:
+                target.error = _failure("processing", exc)
+                print(f"✘ {target.slug}: {target.error}")
+                continue
+            print(f"✔ processed {target.slug} in {target.timings['process']:.1f}s")
+
+    return targets
+
+def print_summary(targets: list[Target], wall: float) -> None:
+    width = max([len(t.slug) for t in targets] + [10])
+    print(f"\n{'repository':<{width}}  {'extract':>8}  {'process':>8}  status")
+    for t in targets:
+        cells = [f"{t.timings[s]:7.1f}s" if s in t.timings else f"{'–':>8}" for s in ("extract", "process")]
+        print(f"{t.slug:<{width}}  {cells[0]}  {cells[1]}  {t.error or 'ok'}")
+    failed = sum(t.error is not None for t in targets)
+    print(f"{len(targets) - failed}/{len(targets)} repositories done in {wall:.1f}s")
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Extract and process every repository of a manifest")
+    p.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="JSON list of repositories (github URL or org / repo)")
+    p.add_argument("--only", nargs="+", metavar="SLUG", help="Run only these repositories of the manifest")
+    p.add_argument("--api_key", default=os.environ.get("API_KEY"), help="Github API Key (default: $API_KEY)")
+    p.add_argument("--skip_extraction", action="store_true", help="Only process the datasets already on disk")
+    p.add_argument("--extract_limit", type=int, default=2, help="Repositories extracted concurrently")
+    p.add_argument("--processes", type=int, default=None, help="Processing worker processes (default: CPU count)")
+    p.add_argument("--workers", type=int, default=8, help="Pull requests fetched concurrently within a repository")
+    p.add_argument("--no_cache", action="store_true", help="Do not revalidate GETs against the on‑disk HTTP cache")
+    p.add_argument("--cache_mb", type=int, default=DEFAULT_CACHE_MB, help="Size limit of the HTTP cache")
+    args = p.parse_args()
+
+    if not args.skip_extraction and not args.api_key:
+        p.error("an API key is needed for extraction (--api_key or $API_KEY)")
+
+    cache = None if args.no_cache or args.skip_extraction else enable_http_cache(max_mb=args.cache_mb)
+
+    targets = load_manifest(args.manifest, args.only)
+    start = time.perf_counter()
+    run_batch(targets, args.api_key, args.extract_limit, args.processes, args.workers, args.skip_extraction)
+    print_summary(targets, time.perf_counter() - start)
+
+    if cache is not None:
+        print(cache.report())
+    raise SystemExit(any(t.error for t in targets))
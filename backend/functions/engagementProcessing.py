@@ -17,25 +17,26 @@ import pandas as pd
 from glob import glob
 from pathlib import Path
 from typing import Final
-from utils.dataCleaning import load_concat
+from utils.schema import empty_frame, load_typed, require_datetime
 
 from utils.engagement import (
+    ActivityIndex,
     get_periods,
     metric_active_chat_participation_rate,
     metric_avg_labels_per_open_issue,
     metric_committer_churn_rate,
     metric_committer_concentration_gini,
     metric_count_of_occasional_contributors,
+    metric_occasional_contributors_series,
 )
 
 # ────────────────────────── helpers ────────────────────────── #
 
-EMPTY_DF: Final = pd.DataFrame(columns=["user", "created_at"])
+EMPTY_DF: Final = empty_frame("commits", ["user", "created_at"])
 
-def _safe_load(pattern: str | Path) -> pd.DataFrame:
-    """Return concatenated XLSX or an empty DF if the file is missing."""
-    matches = glob(str(pattern))
-    return load_concat(matches[0]) if matches else EMPTY_DF.copy()
+def _safe_load(base: Path, org: str, repo: str, kind: str, columns=("user", "created_at")) -> pd.DataFrame:
+    """Return the typed dataset (projected on `columns`) or an empty typed DF if it is missing."""
+    return load_typed(base, org, repo, kind, columns)
 
 def _ensure_cols(df: pd.DataFrame, cols: dict[str, str]) -> None:
     """Guarantee presence & dtype for required columns."""
@@ -63,17 +64,32 @@ def _series_from_window(df: pd.DataFrame, periods, metric_fn):
 
 # ────────────────────────── main routine ────────────────────────── #
 
-def process_engagement_metrics(org: str, repo: str) -> None:
-    base = Path(__file__).resolve().parents[1] / "files"
-    stem = f"{org.lower()}_{repo.lower()}"
+ISSUE_COLUMNS = ("user", "created_at", "state", "labels")
+
+def load_engagement_frames(base: Path, org: str, repo: str) -> dict[str, pd.DataFrame]:
+    """Every dataset the engagement metrics read (empty frames for missing ones)."""
+    return {
+        "commits": _safe_load(base, org, repo, "commits"),
+        "pulls": _safe_load(base, org, repo, "pulls"),
+        "issues": _safe_load(base, org, repo, "issues", ISSUE_COLUMNS),
+        "pulls_comments": _safe_load(base, org, repo, "pulls_comments"),
+        "issues_comments": _safe_load(base, org, repo, "issues_comments"),
+    }
+
+def engagement_results(frames: dict[str, pd.DataFrame]) -> dict:
+    """Engagement metrics of the frames of `load_engagement_frames`.
 
-    commits_df = _safe_load(base / f"{stem}_commits.xlsx")
-    if commits_df.empty: commits_df = _safe_load(base / f"{stem}_pulls.xlsx")
-    pulls_df = _safe_load(base / f"{stem}_pulls.xlsx")
+    Commits fall back to the pull requests (the same frame, not a second
+    read) when no commit dataset was extracted.
+    """
+    pulls_df = frames["pulls"]
+    commits_df = frames["commits"]
+    if commits_df.empty: commits_df = pulls_df[["user", "created_at"]]
+    commits_df = commits_df.copy(deep=False)
+    pulls_df = pulls_df.copy(deep=False)
 
-    issues_df = _safe_load(base / f"{stem}_issues.xlsx")
-    pr_comments_df = _safe_load(base / f"{stem}_pulls_comments.xlsx")
-    issue_comments_df = _safe_load(base / f"{stem}_issues_comments.xlsx")
+    issues_df = frames["issues"].copy(deep=False)
+    pr_comments_df, issue_comments_df = frames["pulls_comments"], frames["issues_comments"]
 
     comments_df = (
         pd.concat([pr_comments_df, issue_comments_df], ignore_index=True)
@@ -83,7 +99,7 @@ def process_engagement_metrics(org: str, repo: str) -> None:
 
     for df in (commits_df, issues_df, comments_df, pulls_df):
         _ensure_cols(df, {"user": str, "created_at": "datetime64[ns, UTC]"})
-        df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce", utc=True)
+        require_datetime(df, "created_at")
 
     grids = {
         "day": get_periods("day",   n=30),
@@ -91,7 +107,9 @@ def process_engagement_metrics(org: str, repo: str) -> None:
         "month": get_periods("month", n=30),
     }
 
-    chat_part = {k: metric_active_chat_participation_rate(comments_df, commits_df, v) for k, v in grids.items()}
+    # one activity index (integer user ids, day bitmaps) for every metric and granularity
+    activity = ActivityIndex({"chat": comments_df, "code": commits_df, "pulls": pulls_df})
+    chat_part = {k: metric_active_chat_participation_rate(comments_df, commits_df, v, index=activity) for k, v in grids.items()}
     churn = _json_safe(metric_committer_churn_rate(commits_df))
 
     def _gini_metric(win_df):
@@ -114,36 +132,11 @@ def process_engagement_metrics(org: str, repo: str) -> None:
         .to_dict("records")
     )
 
-    def _occasional_for_window(window_df: pd.DataFrame, end_ts: pd.Timestamp) -> int:
-        """
-        Count contributors who appear in *window_df* (active now)
-        AND have < 3 pull requests in the trailing 365 days.
-        """
-        active_users = window_df["user"].unique()
-        if active_users.size == 0:
-            return 0
-
-        trailing_df = pulls_df[
-            (pulls_df["created_at"] >= end_ts - pd.Timedelta(days=365))
-            & (pulls_df["created_at"] <  end_ts)
-            & (pulls_df["user"].isin(active_users))
-        ]
-        pr_counts = trailing_df.groupby("user").size()
-        return int((pr_counts < 3).sum())
-
-    occasional_series = {}
-    
-    for gran, periods in grids.items():
-        series = []
-        for start, end in periods:
-            window = pulls_df[
-                (pulls_df["created_at"] >= pd.Timestamp(start, tz="UTC"))
-                & (pulls_df["created_at"] <  pd.Timestamp(end, tz="UTC"))
-            ]
-            count = _occasional_for_window(window, pd.Timestamp(end, tz="UTC"))
-            series.append({"x": start.strftime("%Y-%m-%d"), "y": _json_safe(count)})
-        occasional_series[gran] = series
-    
+    occasional_series = {
+        gran: metric_occasional_contributors_series(pulls_df, periods, k=2, index=activity, source="pulls")
+        for gran, periods in grids.items()
+    }
+
     results = {
         "active_chat_participation_rate": chat_part,
         "committer_churn_rate": churn,
@@ -152,6 +145,9 @@ def process_engagement_metrics(org: str, repo: str) -> None:
         "occasional_contributors": occasional_series
     }
 
+    return results
+
+def save_engagement_results(org: str, repo: str, results: dict) -> None:
     out_dir  = Path(__file__).resolve().parents[2] / "metrics" / org / repo
     out_dir.mkdir(parents=True, exist_ok=True)
     out_file = out_dir / "engagementAnalysis.json"
@@ -160,6 +156,10 @@ def process_engagement_metrics(org: str, repo: str) -> None:
 
     print(f"✔ results written to {out_file}")
 
+def process_engagement_metrics(org: str, repo: str) -> None:
+    base = Path(__file__).resolve().parents[1] / "files"
+    save_engagement_results(org, repo, engagement_results(load_engagement_frames(base, org, repo)))
+
 # ────────────────────────── CLI ────────────────────────── #
 
 if __name__ == "__main__":
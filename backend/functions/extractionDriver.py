@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+usage: python extractionDriver.py org_name repo_name api_key --shards 4 [--kind pulls|issues|all] [--restart]
+
+Full extraction of a repository split into index shards that run in
+parallel processes (each with its own page cursor and checkpoint, and an
+equal share of the token's rate limit).  The shards are merged into the
+canonical `<org>_<repo>_<kind>` datasets read by the processors, and the
+watermark is set so later `--incremental` runs continue from there.  A
+rerun of an interrupted run (same kinds and format) resumes it: shards it
+finished are reused and the others continue from their checkpoints.
+
+Only pull requests are split.  The issues listing also holds the PRs, so
+an issue index does not map to a page and every issue shard would list all
+the pages before its range; issues are extracted by one process, next to
+the PR shards.
+"""
+
+import argparse
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
+
+from issueExtractor import extract_issues
+from pullRequestExtractor import extract_pulls
+from utils.httpCache import DEFAULT_CACHE_MB, enable_http_cache, http_cache
+from utils.githubHttp import get_github
+from utils.incremental import save_watermark, watermark_path
+from utils.rateLimit import configure_schedulers
+from utils.shards import (OPEN_END, load_plan, merge_shards, plan_path, remove_shard_files, save_plan,
+                          shard_paths, shard_ranges)
+from utils.storage import DEFAULT_FORMAT, FORMATS
+
+def _init_shard(share: float, cache_mb: int | None) -> None:
+    configure_schedulers(share=share)
+    if cache_mb:
+        enable_http_cache(max_mb=cache_mb)
+
+def _run_shard(kind: str, org_name: str, repo_name: str, api_key: str, shard: tuple,
+               workers: int, fmt: str, checkpoint_every: int, full_reactions: bool, restart: bool) -> None:
+    if kind == "pulls":
+        extract_pulls(org_name, repo_name, api_key, shard[0], shard[1], workers=workers, fmt=fmt,
+                      checkpoint_every=checkpoint_every, restart=restart, full_reactions=full_reactions)
+    else:
+        extract_issues(org_name, repo_name, api_key, shard[0], shard[1], fmt=fmt,
+                       checkpoint_every=checkpoint_every, restart=restart, full_reactions=full_reactions)
+    if http_cache() is not None:
+        print(f"[{kind} {shard[0]}–{shard[1]}] {http_cache().report()}")
+
+def _listing_sizes(org_name: str, repo_name: str, api_key: str) -> tuple[int, int, int]:
+    """(pulls, issues, page size); the issues listing also counts PRs."""
+    gh = get_github(api_key)
+    repo = gh.get_organization(org_name).get_repo(repo_name)
+    pulls = repo.get_pulls(state="all").totalCount
+    issues = repo.get_issues(state="all").totalCount - pulls
+    return pulls, max(issues, 0), gh.per_page
+
+def extract_sharded(org_name: str, repo_name: str, api_key: str, kinds=("pulls", "issues"), shards: int = 4,
+                    workers: int = 8, fmt: str = DEFAULT_FORMAT, export_xlsx: bool = False,
+                    checkpoint_every: int = 500, keep_shards: bool = False, full_reactions: bool = False,
+                    cache_mb: int | None = DEFAULT_CACHE_MB, restart: bool = False) -> None:
+    """Extract `kinds` in shards, resuming the unfinished run of the same
+    kinds and format unless `restart`; `cache_mb=None` disables the HTTP
+    cache of the shard processes."""
+    out_dir = Path(__file__).resolve().parents[1] / "files"
+    out_dir.mkdir(exist_ok=True)
+    plan_file = plan_path(out_dir, org_name, repo_name)
+
+    unfinished = None if restart else load_plan(plan_file)
+    if unfinished is not None and unfinished[1] == fmt and set(kinds) <= set(unfinished[2]):
+        started, _, splits = unfinished
+        fresh = False
+        print(f"Resuming the run started at {started.isoformat()}")
+    else:
+        # shards fetch their items at different times, so only the moment before
+        # the first listing is a safe watermark
+        started = datetime.now(timezone.utc)
+        n_pulls, n_issues, per_page = _listing_sizes(org_name, repo_name, api_key)
+        print(f"pulls: {n_pulls} items, issues: {n_issues} items")
+        splits = {"pulls": shard_ranges(n_pulls, shards, per_page), "issues": [(0, OPEN_END)]}
+        splits = {kind: splits[kind] for kind in kinds}
+        fresh = True
+        # shard files of any other run are stale (and their ranges may differ)
+        removed = sum(remove_shard_files(out_dir, org_name, repo_name, kind) for kind in kinds)
+        if removed:
+            print(f"Removed {removed} shard files of a previous run")
+        save_plan(plan_file, started, fmt, splits)
+
+    plan = [(kind, shard) for kind in kinds for shard in splits[kind]]
+    for kind in kinds:
+        print(f"{kind}: {len(splits[kind])} shards")
+
+    todo = [(kind, shard) for kind, shard in plan
+            if not all(p.exists() for p in shard_paths(out_dir, org_name, repo_name, kind, shard, fmt))]
+    if len(todo) < len(plan):
+        print(f"Reusing {len(plan) - len(todo)} shards extracted earlier in this run")
+
+    if todo:
+        # every shard process paces on an equal allotment of the token's hourly
+        # budget, so together they spend all of it (benchmarks/rateLimitShareCheck.py)
+        init = partial(_init_shard, 1 / len(todo), cache_mb)
+        # spawned (not forked) so no process inherits another's open connections
+        with ProcessPoolExecutor(max_workers=len(todo), mp_context=get_context("spawn"), initializer=init) as pool:
+            # a fresh run also discards the checkpoints other runs left for the same ranges
+            futures = [pool.submit(_run_shard, kind, org_name, repo_name, api_key, shard, workers, fmt,
+                                   checkpoint_every, full_reactions, fresh)
+                       for kind, shard in todo]
+            for f in futures:
+                f.result()
+
+    mark_path = watermark_path(out_dir, org_name, repo_name)
+    for kind in kinds:
+        items, children = merge_shards(out_dir, org_name, repo_name, kind, splits[kind], fmt, export_xlsx)
+        save_watermark(mark_path, kind, started)
+        print(f"Merged {kind}: {len(items)} items, {len(children)} comments")
+
+        if not keep_shards:
+            for shard in splits[kind]:
+                for path in shard_paths(out_dir, org_name, repo_name, kind, shard, fmt):
+                    path.unlink(missing_ok=True)
+
+    plan_file.unlink(missing_ok=True)
+    print("Done ✔︎   →", out_dir)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Sharded full extraction of pull requests and issues")
+    p.add_argument("org_name",  help="GitHub organization / user name")
+    p.add_argument("repo_name", help="Repository name")
+    p.add_argument("api_key", help="Github API Key")
+    p.add_argument("--kind", choices=["pulls", "issues", "all"], default="all", help="Datasets to extract")
+    p.add_argument("--shards", type=int, default=4, help="Shards (processes) of the pull requests")
+    p.add_argument("--workers", type=int, default=8, help="Pull requests fetched concurrently within a shard")
+    p.add_argument("--format", choices=[f for f in FORMATS if f != "xlsx"], default=DEFAULT_FORMAT, help="Storage format of the datasets")
+    p.add_argument("--export_xlsx", action="store_true", help="Also write an .xlsx copy of the merged datasets")
+    p.add_argument("--checkpoint_every", type=int, default=500, help="Save progress every N items per shard")
+    p.add_argument("--full_reactions", action="store_true", help="List every reaction instead of reading the embedded counts")
+    p.add_argument("--keep_shards", action="store_true", help="Keep the per‑shard files after merging (until the next run)")
+    p.add_argument("--restart", action="store_true", help="Discard the shards of an unfinished run and start over")
+    p.add_argument("--no_cache", action="store_true", help="Do not revalidate GETs against the on‑disk HTTP cache")
+    p.add_argument("--cache_mb", type=int, default=DEFAULT_CACHE_MB, help="Size limit of the HTTP cache")
+    args = p.parse_args()
+
+    cache_mb = None if args.no_cache else args.cache_mb
+    cache = None if cache_mb is None else enable_http_cache(max_mb=cache_mb)
+
+    kinds = ("pulls", "issues") if args.kind == "all" else (args.kind,)
+    extract_sharded(args.org_name, args.repo_name, args.api_key, kinds, args.shards, args.workers,
+                    args.format, args.export_xlsx, args.checkpoint_every, args.keep_shards, args.full_reactions, cache_mb, args.restart)
+
+    if cache is not None:
+        print(cache.report())
\ No newline at end of file
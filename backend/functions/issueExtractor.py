@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
 usage: python issueExtractor.py org_name repo_name apiKey min_issues max_issues
+       python issueExtractor.py org_name repo_name apiKey --incremental
 """
 
 import argparse
@@ -8,87 +9,164 @@ import os
 import re
 import pandas as pd
 
-from collections import Counter
+from datetime import datetime, timezone
 from dotenv import load_dotenv
-from github import Github
 from utils.dataCleaning import *
+from utils.checkpoint import Checkpoint, paged_items
+from utils.httpCache import DEFAULT_CACHE_MB, enable_http_cache
+from utils.githubHttp import get_github
+from utils.reactions import reaction_counts
+from utils.githubGraphQL import GraphQLTransport, fetch_issue_rows
+from utils.storage import DEFAULT_FORMAT, FORMATS, frame_from_rows, load_dataset, write_dataset
+from utils.incremental import load_watermark, replace_children, save_watermark, upsert_rows, watermark_path
+from utils.shards import OPEN_END
 from pathlib import Path
 
-def extract_issues(org_name: str, repo_name: str, apiKey: str, min_issues: int = 0, max_issues: int = None) -> None:
-    gh = Github(apiKey)
-    org = gh.get_organization(org_name)
-    repo = org.get_repo(repo_name)
-    issues, comments = [], []
-    count = 0
-    
-    for issue in repo.get_issues(state="all"):
-        if issue.pull_request:
-            continue
-        
-        if count < min_issues:
-            count += 1
-            continue
-        
-        if max_issues is not None and count >= max_issues:
-            break
-
-        issues.append({
-            # IDENTITY
-            "number":     issue.number,
-            "id":         issue.id,
-            "html_url":   issue.html_url,
-
-            # TEXT
-            "title":      issue.title,
-            "body":       issue.body,
-
-            # TIMESTAMPS
-            "created_at": issue.created_at,
-            "updated_at": issue.updated_at,
-            "closed_at":  issue.closed_at,
-
-            # STATE / REVIEW
-            "state":      issue.state,
-            "locked":     issue.locked,
-            "author":     issue.user.login,
-
-            # labels & milestone
-            "labels":     [lbl.name for lbl in issue.labels],
-            "milestone":  getattr(issue.milestone, "title", None),
-
-            # USERS & REFS
-            "assignees":  [u.login for u in issue.assignees],
-            "comments":   issue.comments, 
-            "reactions":  dict(Counter(r.content for r in list(issue.get_reactions()))),
-        })
-
-        for c in issue.get_comments():
-            creactions = list(c.get_reactions())
-            comments.append({
-                "issue_number": issue.number,
-                "comment_id": c.id,
-                "user": c.user.login,
-                "created_at": c.created_at,
-                "body": c.body,
-                "reactions": dict(Counter(r.content for r in creactions)),
-            })
-
-    issues_df = clean_text_columns(pd.DataFrame(issues).astype(str))
-    comments_df  = clean_text_columns(pd.DataFrame(comments).astype(str))
+def _issue_row(issue, full_reactions: bool = False) -> dict:
+    return {
+        # IDENTITY
+        "number":     issue.number,
+        "id":         issue.id,
+        "html_url":   issue.html_url,
+
+        # TEXT
+        "title":      issue.title,
+        "body":       issue.body,
+
+        # TIMESTAMPS
+        "created_at": issue.created_at,
+        "updated_at": issue.updated_at,
+        "closed_at":  issue.closed_at,
+
+        # STATE / REVIEW
+        "state":      issue.state,
+        "locked":     issue.locked,
+        "author":     issue.user.login,
+
+        # labels & milestone
+        "labels":     [lbl.name for lbl in issue.labels],
+        "milestone":  getattr(issue.milestone, "title", None),
+
+        # USERS & REFS
+        "assignees":  [u.login for u in issue.assignees],
+        "comments":   issue.comments, 
+        "reactions":  reaction_counts(issue, full_reactions),
+    }
+
+def _issue_comment_row(issue_number: int, c, full_reactions: bool = False) -> dict:
+    return {
+        "issue_number": issue_number,
+        "comment_id": c.id,
+        "user": c.user.login,
+        "created_at": c.created_at,
+        "body": c.body,
+        "reactions": reaction_counts(c, full_reactions),
+    }
+
+def _issue_comment_rows(issue, full_reactions: bool = False) -> list:
+    return [_issue_comment_row(issue.number, c, full_reactions) for c in issue.get_comments()]
+
+def extract_issues(org_name: str, repo_name: str, apiKey: str, min_issues: int = 0, max_issues: int = None, incremental: bool = False, transport: GraphQLTransport = None, fmt: str = DEFAULT_FORMAT, export_xlsx: bool = False, checkpoint_every: int = 500, restart: bool = False, full_reactions: bool = False) -> None:
+    """Export issues [min_issues, max_issues) + comments; pass a `transport` to use the GraphQL backend.
+
+    REST runs are checkpointed every `checkpoint_every` issues and resume
+    where a previous run of the same range stopped (unless `restart`).  A run
+    of the whole listing also writes the canonical datasets and the watermark
+    `--incremental` runs continue from.
+    """
+    ckpt = None
+    started = datetime.now(timezone.utc)
+    if transport is not None:
+        issues, comments = map(frame_from_rows, fetch_issue_rows(transport, org_name, repo_name, min_issues, max_issues))
+    else:
+        gh = get_github(apiKey)
+        org = gh.get_organization(org_name)
+        repo = org.get_repo(repo_name)
+
+        if incremental:
+            return extract_issues_incremental(repo, org_name, repo_name, fmt, export_xlsx, full_reactions)
+
+        out_dir = Path(__file__).resolve().parents[1] / "files"
+        ckpt = Checkpoint(out_dir, org_name, repo_name, "issues", (min_issues, max_issues),
+                          gh.per_page, checkpoint_every, restart)
+
+        # PRs share the issues listing but take no index, so the first page of
+        # the range is unknown and earlier pages are still listed once
+        listing = repo.get_issues(state="all")
+        for tag, value in paged_items(listing, ckpt.page, ckpt.count, min_issues, max_issues,
+                                      counted=lambda issue: not issue.pull_request):
+            if tag == "page":
+                ckpt.page_done(*value)
+                continue
+            ckpt.add(issues=[_issue_row(value, full_reactions)], issues_comments=_issue_comment_rows(value, full_reactions))
+
+        parts = ckpt.finish({"issues": "id", "issues_comments": "comment_id"})
+        issues, comments = parts["issues"], parts["issues_comments"]
+
+    issues_df = clean_text_columns(issues)
+    comments_df = clean_text_columns(comments)
 
     out_dir = Path(__file__).resolve().parents[1] / "files"
     out_dir.mkdir(exist_ok=True)
 
-    issues_df.to_excel(
-        f"{out_dir}/{org_name.lower()}_{repo_name.lower()}_{min_issues}_{max_issues}_issues.xlsx",
-        engine="openpyxl",
-    )
-    comments_df.to_excel(
-        f"{out_dir}/{org_name.lower()}_{repo_name.lower()}_{min_issues}_{max_issues}_issues_comments.xlsx",
-        engine="openpyxl",
-    )
+    shard = (min_issues, max_issues)
+    write_dataset(issues_df, out_dir, org_name, repo_name, "issues", fmt, shard, export_xlsx)
+    write_dataset(comments_df, out_dir, org_name, repo_name, "issues_comments", fmt, shard, export_xlsx)
+    if min_issues == 0 and max_issues in (None, OPEN_END):
+        # the whole listing: it is the canonical dataset, and --incremental
+        # runs continue from when this run started
+        write_dataset(issues_df, out_dir, org_name, repo_name, "issues", fmt, export_xlsx=export_xlsx)
+        write_dataset(comments_df, out_dir, org_name, repo_name, "issues_comments", fmt, export_xlsx=export_xlsx)
+        save_watermark(watermark_path(out_dir, org_name, repo_name), "issues",
+                       ckpt.started if ckpt is not None else started)
+    if ckpt is not None:
+        ckpt.discard()
     print("Done ✔︎")
 
+def extract_issues_incremental(repo, org_name: str, repo_name: str, fmt: str = DEFAULT_FORMAT, export_xlsx: bool = False, full_reactions: bool = False) -> None:
+    """Fetch only issues updated since the stored watermark and upsert them
+    into the canonical `<org>_<repo>_issues` dataset."""
+    out_dir = Path(__file__).resolve().parents[1] / "files"
+    out_dir.mkdir(exist_ok=True)
+    mark_path = watermark_path(out_dir, org_name, repo_name)
+
+    since = load_watermark(mark_path, "issues")
+    if since is None:
+        print("No watermark found – running a full extraction.")
+        listing = repo.get_issues(state="all", sort="updated", direction="asc")
+    else:
+        print(f"Fetching issues updated since {since.isoformat()}")
+        listing = repo.get_issues(state="all", sort="updated", direction="asc", since=since)
+
+    issues, comments, refreshed = [], [], []
+    high_water = since
+
+    for issue in listing:
+        if high_water is None or issue.updated_at > high_water:
+            high_water = issue.updated_at
+
+        if issue.pull_request:
+            continue
+
+        issues.append(_issue_row(issue, full_reactions))
+        comments.extend(_issue_comment_rows(issue, full_reactions))
+        refreshed.append(issue.number)
+
+    issues_df = clean_text_columns(frame_from_rows(issues))
+    comments_df = clean_text_columns(frame_from_rows(comments))
+
+    existing_issues = load_dataset(out_dir, org_name, repo_name, "issues")
+    existing_comments = load_dataset(out_dir, org_name, repo_name, "issues_comments")
+
+    issues_df = upsert_rows(existing_issues, issues_df, key="id")
+    comments_df = replace_children(existing_comments, comments_df, "issue_number", refreshed)
+
+    write_dataset(issues_df, out_dir, org_name, repo_name, "issues", fmt, export_xlsx=export_xlsx)
+    write_dataset(comments_df, out_dir, org_name, repo_name, "issues_comments", fmt, export_xlsx=export_xlsx)
+    save_watermark(mark_path, "issues", high_water)
+
+    print(f"Upserted {len(issues)} issues ({len(issues_df)} total) ✔︎")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Export GitHub issues + comments.")
     parser.add_argument("org_name",  help="GitHub organization / user name")
@@ -96,6 +174,30 @@ if __name__ == "__main__":
     parser.add_argument("api_key", help="Github API Key")
     parser.add_argument("--min_issues", type=int, default=0, help="Min Issues (Starting Index)")
     parser.add_argument("--max_issues", type=int, default=10000000, help="Max Issues (Ending Index)")
+    parser.add_argument("--incremental", action="store_true", help="Only fetch issues updated since the last run and upsert them")
+    parser.add_argument("--backend", choices=["rest", "graphql"], default="rest", help="GitHub API used for extraction")
+    parser.add_argument("--api_url", default="https://api.github.com", help="API root for the GraphQL backend (e.g. a local mock server)")
+    parser.add_argument("--fixtures", help="Directory of recorded GraphQL responses")
+    parser.add_argument("--fixture_mode", choices=["live", "record", "replay"], default="live", help="Record responses to / replay them from --fixtures")
+    parser.add_argument("--format", choices=[f for f in FORMATS if f != "xlsx"], default=DEFAULT_FORMAT, help="Storage format of the datasets")
+    parser.add_argument("--export_xlsx", action="store_true", help="Also write an .xlsx copy of every dataset")
+    parser.add_argument("--checkpoint_every", type=int, default=500, help="Save progress every N issues")
+    parser.add_argument("--full_reactions", action="store_true", help="List every reaction instead of reading the embedded counts (one extra call per issue and comment)")
+    parser.add_argument("--restart", action="store_true", help="Discard a saved checkpoint of this range and start over")
+    parser.add_argument("--no_cache", action="store_true", help="Do not revalidate GETs against the on‑disk HTTP cache")
+    parser.add_argument("--cache_mb", type=int, default=DEFAULT_CACHE_MB, help="Size limit of the HTTP cache")
     args = parser.parse_args()
 
-    extract_issues(args.org_name, args.repo_name, args.api_key, args.min_issues, args.max_issues)
\ No newline at end of file
+    cache = None if args.no_cache else enable_http_cache(max_mb=args.cache_mb)
+
+    if args.backend == "graphql" and args.incremental:
+        parser.error("--incremental is only supported by the rest backend")
+
+    transport = None
+    if args.backend == "graphql":
+        transport = GraphQLTransport(args.api_key, api_url=args.api_url, fixtures=args.fixtures, mode=args.fixture_mode)
+
+    extract_issues(args.org_name, args.repo_name, args.api_key, args.min_issues, args.max_issues, args.incremental, transport, args.format, args.export_xlsx, args.checkpoint_every, args.restart, args.full_reactions)
+
+    if cache is not None:
+        print(cache.report())
\ No newline at end of file
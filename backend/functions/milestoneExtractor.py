@@ -6,15 +6,16 @@ usage: python milestoneExtractor.py org_name repo_name apiKey
 import argparse
 import os
 import re
-import pandas as pd
 
 from dotenv import load_dotenv
-from github import Github
 from utils.dataCleaning import *
+from utils.httpCache import DEFAULT_CACHE_MB, enable_http_cache
+from utils.githubHttp import get_github
+from utils.storage import DEFAULT_FORMAT, FORMATS, frame_from_rows, write_dataset
 from pathlib import Path
 
-def extract_milestones(org_name: str, repo_name: str, apiKey: str) -> None:
-    gh = Github(apiKey)
+def extract_milestones(org_name: str, repo_name: str, apiKey: str, fmt: str = DEFAULT_FORMAT, export_xlsx: bool = False) -> None:
+    gh = get_github(apiKey)
     org  = gh.get_organization(org_name)
     repo = org.get_repo(repo_name)
 
@@ -35,10 +36,7 @@ def extract_milestones(org_name: str, repo_name: str, apiKey: str) -> None:
     out_dir = Path(__file__).resolve().parents[1] / "files"
     out_dir.mkdir(exist_ok=True)
 
-    pd.DataFrame(milestones).astype(str).to_excel(
-        f"{out_dir}/{org_name.lower()}_{repo_name.lower()}_milestones.xlsx",
-        engine="openpyxl",
-    )
+    write_dataset(frame_from_rows(milestones), out_dir, org_name, repo_name, "milestones", fmt, export_xlsx=export_xlsx)
 
     print("Done ✔︎")
     
@@ -48,6 +46,15 @@ if __name__ == "__main__":
     parser.add_argument("org_name",  help="GitHub organization / user name")
     parser.add_argument("repo_name", help="Repository name")
     parser.add_argument("api_key", help="Github API Key")
+    parser.add_argument("--format", choices=[f for f in FORMATS if f != "xlsx"], default=DEFAULT_FORMAT, help="Storage format of the dataset")
+    parser.add_argument("--export_xlsx", action="store_true", help="Also write an .xlsx copy of the dataset")
+    parser.add_argument("--no_cache", action="store_true", help="Do not revalidate GETs against the on‑disk HTTP cache")
+    parser.add_argument("--cache_mb", type=int, default=DEFAULT_CACHE_MB, help="Size limit of the HTTP cache")
     args = parser.parse_args()
 
-    extract_milestones(args.org_name, args.repo_name, args.api_key)
\ No newline at end of file
+    cache = None if args.no_cache else enable_http_cache(max_mb=args.cache_mb)
+
+    extract_milestones(args.org_name, args.repo_name, args.api_key, args.format, args.export_xlsx)
+
+    if cache is not None:
+        print(cache.report())
\ No newline at end of file
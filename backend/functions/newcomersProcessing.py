@@ -8,43 +8,46 @@ from pathlib import Path
 from glob import glob
 from utils.dataCleaning import *
 from utils.newcomers import *
+from utils.schema import load_typed
 
 import argparse, json, math
 import numpy as np
 import pandas as pd
 
-def process_newcomer_metrics(org, repo):
-    base = Path(__file__).resolve().parents[1] / "files"
-    pr_df = load_concat(str(base / f"{org.lower()}_{repo.lower()}_pulls.xlsx"))
-    pr_comments_df = load_concat(str(base / f"{org.lower()}_{repo.lower()}_pulls_comments.xlsx"))
+PR_COLUMNS = ["user", "created_at", "merged_at"]
+
+def newcomer_results(pr_df: pd.DataFrame) -> dict:
+    # one per-user contribution table for every cohort metric
+    index = ContributionIndex(pr_df)
 
     day_pts = get_periods("day", n=30)
     week_pts = get_periods("week", n=30)
     month_pts = get_periods("month", n=30)
 
-    newcomers_day = metric_newcomers_count(pr_df, day_pts),
-    newcomers_week = metric_newcomers_count(pr_df, week_pts)
-    newcomers_month = metric_newcomers_count(pr_df, month_pts)
-
-    day_pts = get_periods("day", n=30, cutoff_days=90)
-    week_pts = get_periods("week", n=30, cutoff_days=90)
-    month_pts = get_periods("month", n=30, cutoff_days=90)
+    newcomers_day = metric_newcomers_count(pr_df, day_pts, index),
+    newcomers_week = metric_newcomers_count(pr_df, week_pts, index)
+    newcomers_month = metric_newcomers_count(pr_df, month_pts, index)
 
-    newcomers_90retention_day = metric_retention_90d(pr_df, day_pts),
-    newcomers_90retention_week = metric_retention_90d(pr_df, week_pts)
-    newcomers_90retention_month = metric_retention_90d(pr_df, month_pts)
+    # each retention lookahead samples the cohorts old enough for it to have elapsed
+    retention = {
+        name: {
+            period: metric_retention(pr_df, get_periods(period, n=30, cutoff_days=lookahead.days), {name: lookahead}, index)[name]
+            for period in ("week", "month")
+        }
+        for name, lookahead in RETENTION_LOOKAHEADS.items()
+    }
 
     day_pts = get_periods("day", n=30)
     week_pts = get_periods("week", n=30)
     month_pts = get_periods("month", n=30)
 
-    newcomers_success_day = metric_onboarding_success(pr_df, day_pts)
-    newcomers_success_week = metric_onboarding_success(pr_df, week_pts)
-    newcomers_success_month = metric_onboarding_success(pr_df, month_pts)
+    newcomers_success_day = metric_onboarding_success(pr_df, day_pts, index)
+    newcomers_success_week = metric_onboarding_success(pr_df, week_pts, index)
+    newcomers_success_month = metric_onboarding_success(pr_df, month_pts, index)
     
-    median_second_contribution_day = metric_median_time_to_second_contribution(pr_df, day_pts)
-    median_second_contribution_week = metric_median_time_to_second_contribution(pr_df, week_pts)
-    median_second_contribution_month = metric_median_time_to_second_contribution(pr_df, month_pts)
+    median_second_contribution_day = metric_median_time_to_second_contribution(pr_df, day_pts, index)
+    median_second_contribution_week = metric_median_time_to_second_contribution(pr_df, week_pts, index)
+    median_second_contribution_month = metric_median_time_to_second_contribution(pr_df, month_pts, index)
 
     results = {
         "newcomers_count": {
@@ -52,10 +55,7 @@ def process_newcomer_metrics(org, repo):
             "week": newcomers_week,
             "month": newcomers_month,
         },
-        "retention_90d": {
-            "week": newcomers_90retention_week,
-            "month": newcomers_90retention_month,
-        },
+        "retention_90d": retention["90d"],
         "onboarding_success": {
             "day": newcomers_success_day,
             "week": newcomers_success_week,
@@ -65,9 +65,14 @@ def process_newcomer_metrics(org, repo):
             "day": median_second_contribution_day,
             "week": median_second_contribution_week,
             "month": median_second_contribution_month,
-        }
+        },
+        "retention_30d": retention["30d"],
+        "retention_180d": retention["180d"],
     }
 
+    return results
+
+def save_newcomer_results(org, repo, results: dict) -> None:
     out_dir = Path(__file__).resolve().parents[2] / "metrics" / org / repo
     out_dir.mkdir(parents=True, exist_ok=True)
     
@@ -76,6 +81,11 @@ def process_newcomer_metrics(org, repo):
     
     print(f"✔ results written to {out_dir/'newcomerAnalysis.json'}")
 
+def process_newcomer_metrics(org, repo):
+    base = Path(__file__).resolve().parents[1] / "files"
+    pr_df = load_typed(base, org, repo, "pulls", PR_COLUMNS)
+    save_newcomer_results(org, repo, newcomer_results(pr_df))
+
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("org_name")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+usage: python pipeline.py org_name repo_name
+
+Runs every metric family of a repository – issue and pull request
+productivity, newcomers and engagement – in one interpreter.  Each dataset
+is read once (projected on the union of the columns the families use) and
+typed once by `utils.schema`; every family gets a shallow,
+copy‑on‑write view of the shared frames, so nothing one family derives
+leaks into another.  Writes the four JSON files the separate processors
+write.
+"""
+
+import argparse
+import time
+
+from pathlib import Path
+
+import pandas as pd
+
+from engagementProcessing import ISSUE_COLUMNS, engagement_results, save_engagement_results
+from newcomersProcessing import PR_COLUMNS, newcomer_results, save_newcomer_results
+from utils.productivity import ENTITIES, compute_productivity, save_productivity
+from utils.schema import apply_schema, empty_frame
+from utils.storage import find_dataset, read_frame
+
+KINDS = ("pulls", "pulls_comments", "issues", "issues_comments", "commits")
+BASE_COLUMNS = ("user", "created_at")
+
+def _columns() -> dict[str, list[str]]:
+    """Union of the columns every family reads, per dataset kind."""
+    wanted = {kind: dict.fromkeys(BASE_COLUMNS) for kind in KINDS}
+    for entity in ENTITIES.values():
+        wanted[entity.kind].update(dict.fromkeys(entity.item_columns))
+        wanted[entity.comments_kind].update(dict.fromkeys(entity.comment_columns))
+    wanted["pulls"].update(dict.fromkeys(PR_COLUMNS))
+    wanted["issues"].update(dict.fromkeys(ISSUE_COLUMNS))
+    return {kind: list(cols) for kind, cols in wanted.items()}
+
+def load_repo(files_dir: Path, org_name: str, repo_name: str) -> dict[str, pd.DataFrame | None]:
+    """Every dataset of the repository, typed once; None for kinds never extracted."""
+    frames = {}
+    for kind, columns in _columns().items():
+        path = find_dataset(files_dir, org_name, repo_name, kind)
+        if path is None:
+            frames[kind] = None
+            continue
+        df = apply_schema(read_frame(path, columns), kind)
+        frames[kind] = df
+        print(f"Loaded {path.name}: {len(df)} rows")
+    return frames
+
+def _view(frames: dict, kind: str, columns) -> pd.DataFrame:
+    """Shallow copy of dataset `kind` on the `columns` it has (an empty typed frame when it is missing)."""
+    df = frames[kind]
+    if df is None:
+        return empty_frame(kind, columns)
+    return df[[c for c in columns if c in df.columns]].copy(deep=False)
+
+def run_pipeline(org_name: str, repo_name: str) -> None:
+    files_dir = Path(__file__).resolve().parents[1] / "files"
+
+    start = time.perf_counter()
+    frames = load_repo(files_dir, org_name, repo_name)
+    print(f"Datasets loaded in {time.perf_counter() - start:.1f}s")
+
+    for entity in ENTITIES.values():
+        start = time.perf_counter()
+        if frames[entity.kind] is None or frames[entity.comments_kind] is None:
+            print(f"No {entity.kind} or comment files found, skipping {entity.output}.")
+            continue
+        results, sketches = compute_productivity(entity, _view(frames, entity.kind, entity.item_columns),
+                                                 _view(frames, entity.comments_kind, entity.comment_columns))
+        save_productivity(org_name, repo_name, entity, results, sketches)
+        print(f"{entity.output} in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    save_newcomer_results(org_name, repo_name, newcomer_results(_view(frames, "pulls", PR_COLUMNS)))
+    print(f"newcomerAnalysis.json in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    engagement_frames = {
+        kind: _view(frames, kind, ISSUE_COLUMNS if kind == "issues" else BASE_COLUMNS)
+        for kind in ("commits", "pulls", "issues", "pulls_comments", "issues_comments")
+    }
+    save_engagement_results(org_name, repo_name, engagement_results(engagement_frames))
+    print(f"engagementAnalysis.json in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute every metric family of a repository from one load of its datasets")
+    parser.add_argument("org_name",  help="GitHub organization / user name")
+    parser.add_argument("repo_name", help="Repository name")
+    args = parser.parse_args()
+
+    run_pipeline(args.org_name, args.repo_name)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
 usage: python pullRequestExtractor.py ORG REPO API_KEY, MIN_PULL, MAX_PULL
+       python pullRequestExtractor.py ORG REPO API_KEY --incremental
 """
 
 import argparse
@@ -8,100 +9,200 @@ import os
 import re
 import pandas as pd
 
-from collections import Counter
+from functools import partial
+from datetime import datetime, timezone
 from dotenv import load_dotenv
-from github import Github
 from utils.dataCleaning import *
+from utils.checkpoint import Checkpoint, paged_items
+from utils.reactions import counts_from_listing, counts_from_rollup, expand
+from utils.githubGraphQL import GraphQLTransport, fetch_pull_rows
+from utils.httpCache import DEFAULT_CACHE_MB, enable_http_cache
+from utils.githubHttp import fetch_in_order, get_github
+from utils.storage import DEFAULT_FORMAT, FORMATS, frame_from_rows, load_dataset, write_dataset
+from utils.incremental import load_watermark, replace_children, save_watermark, upsert_rows, watermark_path
+from utils.shards import OPEN_END
 from pathlib import Path
 
-def extract_pulls(org_name: str, repo_name: str, api_key: str, min_pull: int = 0, max_pull: int = None) -> None:
-    gh = Github(api_key)
-    repo = gh.get_organization(org_name).get_repo(repo_name)
-    pull_rows, comment_rows = [], []
-    count = 0
-
-    for pr in repo.get_pulls(state="all"):
-        if count < min_pull:
-            count += 1
-            continue
-        
-        if max_pull is not None and count >= max_pull:
-            break
-
-        pull_rows.append({
-            # IDENTITY
-            "number": pr.number,
-            "id":     pr.id,
-
-            # TEXT
-            "title": pr.title,
-            "body":  pr.body,
-
-            # TIMESTAMPS
-            "created_at": pr.created_at,
-            "updated_at": pr.updated_at,
-            "closed_at":  pr.closed_at,
-            "merged_at":  pr.merged_at,
-
-            # STATE / REVIEW
-            "state":           pr.state,
-            "draft":           pr.draft,
-            "mergeable":       pr.mergeable,
-            "mergeable_state": pr.mergeable_state,
-            "merged":          pr.merged,
-            "rebaseable":      pr.rebaseable,
-
-            # COUNTS
-            "commits":       pr.commits,
-            "additions":     pr.additions,
-            "deletions":     pr.deletions,
-            "changed_files": pr.changed_files,
-
-            # USERS & REFS
-            "user":                 pr.user.login,
-            "assignees":            [u.login for u in pr.assignees],
-            "requested_reviewers":  [u.login for u in pr.requested_reviewers],
-            "merged_by":            getattr(pr.merged_by, "email", None),
-
-            # LABELS & MILESTONE
-            "labels":    [lbl.name for lbl in pr.labels],
-            "milestone": getattr(pr.milestone, "id", None),
-        })
-
-        # review comments (file‑anchored)
-        for c in pr.get_comments():
-            reactions = list(c.get_reactions())
-            comment_rows.append({
-                "pr_number":  pr.number,
-                "id":         c.id,
-                "user":       c.user.login,
-                "created_at": c.created_at,
-                "path":       c.path,
-                "position":   c.position,
-                "commit_id":  c.commit_id,
-                "in_reply_to_id": c.in_reply_to_id,
-                "body":       c.body,
-                "reactions":        [r.content for r in reactions],
-                "reaction_counts":  dict(Counter(r.content for r in reactions)),
-            })
-
-    pulls_df = clean_text_columns(pd.DataFrame(pull_rows).astype(str))
-    comments_df = clean_text_columns(pd.DataFrame(comment_rows).astype(str))
+def _pull_row(pr) -> dict:
+    return {
+        # IDENTITY
+        "number": pr.number,
+        "id":     pr.id,
+
+        # TEXT
+        "title": pr.title,
+        "body":  pr.body,
+
+        # TIMESTAMPS
+        "created_at": pr.created_at,
+        "updated_at": pr.updated_at,
+        "closed_at":  pr.closed_at,
+        "merged_at":  pr.merged_at,
+
+        # STATE / REVIEW
+        "state":           pr.state,
+        "draft":           pr.draft,
+        "mergeable":       pr.mergeable,
+        "mergeable_state": pr.mergeable_state,
+        "merged":          pr.merged,
+        "rebaseable":      pr.rebaseable,
+
+        # COUNTS
+        "commits":       pr.commits,
+        "additions":     pr.additions,
+        "deletions":     pr.deletions,
+        "changed_files": pr.changed_files,
+
+        # USERS & REFS
+        "user":                 pr.user.login,
+        "assignees":            [u.login for u in pr.assignees],
+        "requested_reviewers":  [u.login for u in pr.requested_reviewers],
+        "merged_by":            getattr(pr.merged_by, "email", None),
+
+        # LABELS & MILESTONE
+        "labels":    [lbl.name for lbl in pr.labels],
+        "milestone": getattr(pr.milestone, "id", None),
+    }
+
+def _review_comment_row(pr_number: int, c, full_reactions: bool = False) -> dict:
+    if full_reactions:
+        listed = list(c.get_reactions())
+        contents, counts = [r.content for r in listed], counts_from_listing(listed)
+    else:
+        counts = counts_from_rollup(c.reactions)
+        contents = expand(counts)
+    return {
+        "pr_number":  pr_number,
+        "id":         c.id,
+        "user":       c.user.login,
+        "created_at": c.created_at,
+        "path":       c.path,
+        "position":   c.position,
+        "commit_id":  c.commit_id,
+        "in_reply_to_id": c.in_reply_to_id,
+        "body":       c.body,
+        "reactions":        contents,
+        "reaction_counts":  counts,
+    }
+
+def _review_comment_rows(pr, full_reactions: bool = False) -> list:
+    # review comments (file‑anchored)
+    return [_review_comment_row(pr.number, c, full_reactions) for c in pr.get_comments()]
+
+def _fetch_pull(pr, full_reactions: bool = False) -> tuple:
+    """Detail fields, review comments and reactions of one PR (runs in a worker thread)."""
+    return _pull_row(pr), _review_comment_rows(pr, full_reactions)
+
+def extract_pulls(org_name: str, repo_name: str, api_key: str, min_pull: int = 0, max_pull: int = None, incremental: bool = False, workers: int = 8, transport: GraphQLTransport = None, fmt: str = DEFAULT_FORMAT, export_xlsx: bool = False, checkpoint_every: int = 500, restart: bool = False, full_reactions: bool = False) -> None:
+    """Export pull requests [min_pull, max_pull) + review comments; pass a `transport` to use the GraphQL backend.
+
+    REST runs start at the page holding `min_pull`, are checkpointed every
+    `checkpoint_every` PRs and resume where a previous run of the same range
+    stopped (unless `restart`).  A run of the whole listing also writes the
+    canonical datasets and the watermark `--incremental` runs continue from.
+    """
+    ckpt = None
+    started = datetime.now(timezone.utc)
+    if transport is not None:
+        pull_rows, comment_rows = map(frame_from_rows, fetch_pull_rows(transport, org_name, repo_name, min_pull, max_pull))
+    else:
+        gh = get_github(api_key, pool_size=max(workers, 1))
+        repo = gh.get_organization(org_name).get_repo(repo_name)
+
+        if incremental:
+            return extract_pulls_incremental(repo, org_name, repo_name, workers, fmt, export_xlsx, full_reactions)
+
+        out_dir = Path(__file__).resolve().parents[1] / "files"
+        ckpt = Checkpoint(out_dir, org_name, repo_name, "pulls", (min_pull, max_pull),
+                          gh.per_page, checkpoint_every, restart)
+        # every listed item is a PR, so the range starts on a known page
+        first_page = min_pull // gh.per_page
+        ckpt.seek(first_page, first_page * gh.per_page)
+
+        def _fetch(task):
+            tag, value = task
+            return task if tag == "page" else (tag, _fetch_pull(value, full_reactions))
+
+        listing = repo.get_pulls(state="all")
+        tasks = paged_items(listing, ckpt.page, ckpt.count, min_pull, max_pull)
+        for tag, value in fetch_in_order(_fetch, tasks, workers):
+            if tag == "page":
+                ckpt.page_done(*value)
+                continue
+            row, comments = value
+            ckpt.add(pulls=[row], pulls_comments=comments)
+
+        parts = ckpt.finish({"pulls": "id", "pulls_comments": "id"})
+        pull_rows, comment_rows = parts["pulls"], parts["pulls_comments"]
+
+    pulls_df = clean_text_columns(pull_rows)
+    comments_df = clean_text_columns(comment_rows)
 
     out_dir = Path(__file__).resolve().parents[1] / "files"
     out_dir.mkdir(exist_ok=True)
 
-    pulls_df.to_excel(
-        out_dir / f"{org_name.lower()}_{repo_name.lower()}_{min_pull}_{max_pull}_pulls.xlsx",
-        engine="openpyxl"
-    )
+    shard = (min_pull, max_pull)
+    write_dataset(pulls_df, out_dir, org_name, repo_name, "pulls", fmt, shard, export_xlsx)
+    write_dataset(comments_df, out_dir, org_name, repo_name, "pulls_comments", fmt, shard, export_xlsx)
+    if min_pull == 0 and max_pull in (None, OPEN_END):
+        # the whole listing: it is the canonical dataset, and --incremental
+        # runs continue from when this run started
+        write_dataset(pulls_df, out_dir, org_name, repo_name, "pulls", fmt, export_xlsx=export_xlsx)
+        write_dataset(comments_df, out_dir, org_name, repo_name, "pulls_comments", fmt, export_xlsx=export_xlsx)
+        save_watermark(watermark_path(out_dir, org_name, repo_name), "pulls",
+                       ckpt.started if ckpt is not None else started)
+    if ckpt is not None:
+        ckpt.discard()
+    print("Done ✔︎   →", out_dir)
 
-    comments_df.to_excel(
-        out_dir / f"{org_name.lower()}_{repo_name.lower()}_{min_pull}_{max_pull}_pulls_comments.xlsx",
-        engine="openpyxl"
-    )
+def extract_pulls_incremental(repo, org_name: str, repo_name: str, workers: int = 8, fmt: str = DEFAULT_FORMAT, export_xlsx: bool = False, full_reactions: bool = False) -> None:
+    """Fetch only pull requests updated since the stored watermark and upsert
+    them into the canonical `<org>_<repo>_pulls` dataset.
 
-    print("Done ✔︎   →", out_dir)
+    The pulls endpoint has no `since` filter, so the listing is walked newest
+    update first and stops at the first PR older than the watermark.
+    """
+    out_dir = Path(__file__).resolve().parents[1] / "files"
+    out_dir.mkdir(exist_ok=True)
+    mark_path = watermark_path(out_dir, org_name, repo_name)
+
+    since = load_watermark(mark_path, "pulls")
+    if since is None:
+        print("No watermark found – running a full extraction.")
+    else:
+        print(f"Fetching pull requests updated since {since.isoformat()}")
+
+    pull_rows, comment_rows, refreshed = [], [], []
+    high_water = since
+
+    def _updated():
+        for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
+            if since is not None and pr.updated_at < since:
+                break
+            yield pr
+
+    for row, comments in fetch_in_order(partial(_fetch_pull, full_reactions=full_reactions), _updated(), workers):
+        if high_water is None or row["updated_at"] > high_water:
+            high_water = row["updated_at"]
+
+        pull_rows.append(row)
+        comment_rows.extend(comments)
+        refreshed.append(row["number"])
+
+    pulls_df = clean_text_columns(frame_from_rows(pull_rows))
+    comments_df = clean_text_columns(frame_from_rows(comment_rows))
+
+    existing_pulls = load_dataset(out_dir, org_name, repo_name, "pulls")
+    existing_comments = load_dataset(out_dir, org_name, repo_name, "pulls_comments")
+
+    pulls_df = upsert_rows(existing_pulls, pulls_df, key="id")
+    comments_df = replace_children(existing_comments, comments_df, "pr_number", refreshed)
+
+    write_dataset(pulls_df, out_dir, org_name, repo_name, "pulls", fmt, export_xlsx=export_xlsx)
+    write_dataset(comments_df, out_dir, org_name, repo_name, "pulls_comments", fmt, export_xlsx=export_xlsx)
+    save_watermark(mark_path, "pulls", high_water)
+
+    print(f"Upserted {len(pull_rows)} pull requests ({len(pulls_df)} total) ✔︎   →", out_dir)
 
 if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Export pull‑requests + review‑comments")
@@ -110,6 +211,31 @@ if __name__ == "__main__":
     p.add_argument("api_key", help="Github API Key")
     p.add_argument("--min_pull", type=int, default=0, help="Min Pull (Starting Index)")
     p.add_argument("--max_pull", type=int, default=10000000, help="Max Pull (Ending Index)")
+    p.add_argument("--incremental", action="store_true", help="Only fetch pull requests updated since the last run and upsert them")
+    p.add_argument("--workers", type=int, default=8, help="Pull requests fetched concurrently (1 = sequential)")
+    p.add_argument("--backend", choices=["rest", "graphql"], default="rest", help="GitHub API used for extraction")
+    p.add_argument("--api_url", default="https://api.github.com", help="API root for the GraphQL backend (e.g. a local mock server)")
+    p.add_argument("--fixtures", help="Directory of recorded GraphQL responses")
+    p.add_argument("--fixture_mode", choices=["live", "record", "replay"], default="live", help="Record responses to / replay them from --fixtures")
+    p.add_argument("--format", choices=[f for f in FORMATS if f != "xlsx"], default=DEFAULT_FORMAT, help="Storage format of the datasets")
+    p.add_argument("--export_xlsx", action="store_true", help="Also write an .xlsx copy of every dataset")
+    p.add_argument("--checkpoint_every", type=int, default=500, help="Save progress every N pull requests")
+    p.add_argument("--full_reactions", action="store_true", help="List every reaction instead of reading the embedded counts (one extra call per review comment)")
+    p.add_argument("--restart", action="store_true", help="Discard a saved checkpoint of this range and start over")
+    p.add_argument("--no_cache", action="store_true", help="Do not revalidate GETs against the on‑disk HTTP cache")
+    p.add_argument("--cache_mb", type=int, default=DEFAULT_CACHE_MB, help="Size limit of the HTTP cache")
     args = p.parse_args()
-    
-    extract_pulls(args.org_name, args.repo_name, args.api_key, args.min_pull, args.max_pull)
+
+    cache = None if args.no_cache else enable_http_cache(max_mb=args.cache_mb)
+
+    if args.backend == "graphql" and args.incremental:
+        p.error("--incremental is only supported by the rest backend")
+
+    transport = None
+    if args.backend == "graphql":
+        transport = GraphQLTransport(args.api_key, api_url=args.api_url, fixtures=args.fixtures, mode=args.fixture_mode)
+
+    extract_pulls(args.org_name, args.repo_name, args.api_key, args.min_pull, args.max_pull, args.incremental, args.workers, transport, args.format, args.export_xlsx, args.checkpoint_every, args.restart, args.full_reactions)
+
+    if cache is not None:
+        print(cache.report())
\ No newline at end of file
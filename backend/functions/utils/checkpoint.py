@@ -0,0 +1,133 @@
+"""checkpoint.py – crash‑safe progress for long full extractions.
+
+Full extractions walk the REST listing one page at a time
+(`PaginatedList.get_page`) instead of iterating it, so a run can start at any
+page.  Every `every` items the rows fetched so far are appended to part files
+under ``files/checkpoints/<org>_<repo>_<min>_<max>_<kind>/`` (already text
+cleaned, so the final cleaning pass finds nothing left to do) and the next page
+to fetch is recorded in ``state.json`` next to them.  A crashed run loses at
+most the items since the last flush: rerunning the same command continues
+from the recorded page.  When the range is done the parts are merged
+(deduplicated by id) into the usual shard dataset and the checkpoint removed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from utils.dataCleaning import clean_text_columns
+from utils.storage import concat_frames, frame_from_rows, read_frame, write_frame
+
+def paged_items(listing, start_page: int, start_count: int, lo: int = 0, hi: int | None = None,
+                counted: Callable | None = None) -> Iterator[tuple]:
+    """Walk `listing` from `start_page`.
+
+    Yields ``("item", obj)`` for every counted item whose index lies in
+    [lo, hi) and ``("page", (next_page, count))`` after each page, where
+    `count` is the number of counted items before `next_page`.  `counted`
+    filters items that do not take an index (e.g. PRs in the issues listing).
+    """
+    page, count = start_page, start_count
+    while hi is None or count < hi:
+        items = listing.get_page(page)
+        if not items:
+            break
+        for obj in items:
+            if counted is not None and not counted(obj):
+                continue
+            if count >= lo and (hi is None or count < hi):
+                yield "item", obj
+            count += 1
+        page += 1
+        yield "page", (page, count)
+
+class Checkpoint:
+    def __init__(self, out_dir: Path, org_name: str, repo_name: str, kind: str, shard: tuple,
+                 per_page: int, every: int = 500, restart: bool = False) -> None:
+        self.dir = Path(out_dir) / "checkpoints" / f"{org_name.lower()}_{repo_name.lower()}_{shard[0]}_{shard[1]}_{kind}"
+        self.state_path = self.dir / "state.json"
+        self.per_page = per_page
+        self.every = max(every, 1)
+
+        self.page = 0
+        self.count = 0
+        self.parts = 0
+        # when the range was first started, kept across resumes
+        self.started = datetime.now(timezone.utc)
+        self.resumed = False
+        self._rows: dict[str, list] = {}
+        self._buffered = 0
+
+        if restart:
+            self.discard()
+        elif self.state_path.exists():
+            with self.state_path.open(encoding="utf-8") as fh:
+                state = json.load(fh)
+            if state.get("per_page") == per_page:
+                self.page, self.count, self.parts = state["page"], state["count"], state["parts"]
+                # unknown for checkpoints of older runs
+                self.started = datetime.fromisoformat(state["started"]) if state.get("started") else None
+                self.resumed = True
+                print(f"Resuming from checkpoint: page {self.page}, {self.count} items listed")
+            else:
+                print("Checkpoint was written with another page size – starting over.")
+                self.discard()
+
+    def seek(self, page: int, count: int) -> None:
+        """Starting position of a fresh run (ignored when resuming)."""
+        if not self.resumed:
+            self.page, self.count = page, count
+
+    def add(self, **rows: list) -> None:
+        """Buffer the rows of one fetched item, keyed by dataset kind."""
+        for kind, values in rows.items():
+            self._rows.setdefault(kind, []).extend(values)
+        self._buffered += 1
+
+    def page_done(self, next_page: int, count: int) -> None:
+        """Record a finished page; flush once `every` items are buffered."""
+        self.page, self.count = next_page, count
+        if self._buffered == 0 or self._buffered >= self.every:
+            self._flush()
+
+    def _flush(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        if self._buffered:
+            for kind, rows in self._rows.items():
+                if rows:
+                    part = clean_text_columns(frame_from_rows(rows))
+                    write_frame(part, self.dir / f"{kind}_{self.parts:05d}.parquet")
+            self.parts += 1
+            print(f"Checkpoint: {self.count} items listed, next page {self.page}")
+
+        state = {"page": self.page, "count": self.count, "parts": self.parts, "per_page": self.per_page,
+                 "started": self.started.isoformat() if self.started else None}
+        tmp = self.state_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(state, fh, indent=2)
+        os.replace(tmp, self.state_path)
+
+        self._rows, self._buffered = {}, 0
+
+    def finish(self, keys: dict[str, str]) -> dict[str, pd.DataFrame]:
+        """Every row of the run per kind, deduplicated on `keys[kind]`."""
+        frames = {}
+        for kind, key in keys.items():
+            parts = [read_frame(self.dir / f"{kind}_{i:05d}.parquet")
+                     for i in range(self.parts) if (self.dir / f"{kind}_{i:05d}.parquet").exists()]
+            if self._rows.get(kind):
+                parts.append(frame_from_rows(self._rows[kind]))
+            df = concat_frames(parts)
+            frames[kind] = df if df.empty else df.drop_duplicates(subset=key, keep="last").reset_index(drop=True)
+        return frames
+
+    def discard(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
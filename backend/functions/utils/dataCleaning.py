@@ -1,17 +1,52 @@
 import pandas as pd
-import re
 from glob import glob
+from utils.storage import read_frame
+
+# everything outside printable ASCII
+NON_PRINTABLE = r"[^\x20-\x7E]"
+
+# string dtype a per‑cell `Series.apply` returns for text
+_APPLY_STRING_DTYPE = pd.Series(["x"], dtype=object).apply(str).dtype
+
+def _text_cells(s: pd.Series) -> pd.Series:
+    """The string cells of `s` (object columns may mix in numbers, bools …)."""
+    if isinstance(s.dtype, pd.StringDtype) or pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty"):
+        return s
+    return s[s.map(lambda x: isinstance(x, str))].astype(object)
 
 def clean_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip non‑printable / non‑ASCII characters from every string cell.
+
+    Whole columns are scanned with one vectorized regex and only the cells
+    that contain such characters are rewritten, so already clean columns
+    (ids, logins, urls, dates‑as‑text) cost a single pass.  Cleaning is
+    idempotent, so chunks cleaned while extracting stay unchanged when the
+    concatenated dataset is cleaned again.
+    """
     for col in df.select_dtypes(include=["object", "string"]):
-        df[col] = df[col].apply(
-            lambda x: re.sub(r"[^\x20-\x7E]", "", str(x)) if pd.notnull(x) else x
-        )
-        
+        s = df[col]
+        if s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) == "string":
+            # all text: convert up front to the dtype the per‑cell apply this
+            # replaces ended up with, and clean it with the vectorized regex
+            s = s.astype(_APPLY_STRING_DTYPE)
+
+        text = _text_cells(s)
+        if not text.empty:
+            dirty = text.str.contains(NON_PRINTABLE, regex=True, na=False)
+            if dirty.any():
+                idx = dirty.index[dirty.to_numpy()]
+                s = s.copy()
+                s.loc[idx] = text[idx].str.replace(NON_PRINTABLE, "", regex=True)
+
+        if s.dtype != _APPLY_STRING_DTYPE:
+            # the apply also re‑inferred every other column's dtype
+            s = s.astype(object).infer_objects()
+        df[col] = s
+
     return df
 
-def load_concat(pattern: str) -> pd.DataFrame:
+def load_concat(pattern: str, columns=None) -> pd.DataFrame:
     files = sorted(glob(pattern))
     if not files:
         return pd.DataFrame()
-    return pd.concat([pd.read_excel(f) for f in files], ignore_index=True)
\ No newline at end of file
+    return pd.concat([read_frame(f, columns) for f in files], ignore_index=True)
@@ -1,114 +1,134 @@
 import pandas as pd
 import numpy as np
-import json
-
-from glob import glob
-from datetime import datetime, timezone, timedelta
-now = datetime.now(timezone.utc)
-
-def in_range(dt, start, end):
-    return (dt >= start) & (dt < end)
 
 def safe_divide(a: float, b: float, roundBy: int) -> float:
     """Return a / b, but 0 when b is 0 (or None)."""
     return 0 if b == 0 else round(a / b, roundBy)
 
-def get_periods(period='day'):
-    if period == 'day':
-        today = now.date()
-        last = today - timedelta(days=1)
-        before_last = today - timedelta(days=2)
-        return (last, last + timedelta(days=1)), (before_last, last)
-    elif period == 'week':
-        # Weeks start on Monday
-        this_monday = (now - timedelta(days=now.weekday())).date()
-        last_start = this_monday - timedelta(days=7)
-        last_end = this_monday
-        before_last_start = last_start - timedelta(days=7)
-        before_last_end = last_start
-        return (last_start, last_end), (before_last_start, before_last_end)
-    elif period == 'month':
-        first = now.replace(day=1)
-        last_month_end = first
-        last_month_start = (first - pd.offsets.MonthBegin(1)).date()
-        before_last_month_end = last_month_start
-        before_last_month_start = (last_month_start - pd.offsets.MonthBegin(1)).date()
-        return (last_month_start, last_month_end.date()), (before_last_month_start, before_last_month_end)
+def find_first_answers(items: pd.DataFrame, comments: pd.DataFrame, comment_col: str, author_col: str, prefix: str) -> list:
+    """First comment on every item by someone other than its author.
+
+    Comments are sorted once (stably, so ties keep their listing order) and
+    joined to the items on `number` = `comment_col`; self‑comments are
+    dropped and the earliest remaining comment per item is kept.  Records
+    come out in item order, as the per‑item filtering loop produced them.
+    """
+    left = items[["number", author_col, "created_at"]].reset_index(drop=True)
+    left.columns = ["number", "author", "created_at"]
+    left["_pos"] = np.arange(len(left))
+
+    right = comments.loc[comments[comment_col].notna(), [comment_col, "user", "created_at"]]
+    right = right.sort_values("created_at", kind="stable")
+    right.columns = ["number", "answer_author", "answer_at"]
+
+    joined = left.merge(right, on="number", how="inner")
+    joined = joined[joined["answer_author"] != joined["author"]]
+    first = joined.sort_values(["_pos", "answer_at"], kind="stable").drop_duplicates("_pos")
+    hours = (first["answer_at"] - first["created_at"]).dt.total_seconds() / 3600
+
+    return [
+        {
+            f"{prefix}_number": number,
+            f"{prefix}_author": author,
+            f"{prefix}_created_at": created,
+            "first_answer_author": answer_author,
+            "first_answer_at": answer_at,
+            "time_to_first_answer_hours": h,
+        }
+        for number, author, created, answer_author, answer_at, h in zip(
+            first["number"], first["author"], first["created_at"],
+            first["answer_author"], first["answer_at"], hours)
+    ]
+
+def window_bounds(times: np.ndarray, points, period: str) -> tuple[np.ndarray, np.ndarray]:
+    """(start, end] of the rolling window at every point, as int64 nanoseconds.
+
+    Day and week windows reach back one day / week from each point; month
+    windows run from the previous point (the first one from just before
+    the earliest of the sorted `times`).
+    """
+    ends = pd.DatetimeIndex(points).as_unit("ns").asi8
+    if period == "day":
+        starts = ends - pd.Timedelta(days=1).value
+    elif period == "week":
+        starts = ends - pd.Timedelta(weeks=1).value
+    elif period == "month":
+        first = times[0] - pd.Timedelta(seconds=1).value if len(times) else ends[0] - pd.Timedelta(days=30).value
+        starts = np.concatenate(([first], ends[:-1]))
     else:
-        raise ValueError('Invalid period')
-    
-def count_by_period(df, col, start, end):
-    return df[in_range(df[col].dt.date, start, end)].shape[0]
-
-def rolling_avg_first_answer(times, points, period):
-    if not times:
-        print(f"[Warning] No data available for first answer calculation in period '{period}'.")
-        return [np.nan] * len(points)
-
-    avg_times = []
-    for i, end in enumerate(points):
-        if period == "day":
-            start = end - timedelta(days=1)
-        elif period == "week":
-            start = end - timedelta(weeks=1)
-        elif period == "month":
-            if i == 0:
-                try:
-                    start = min(row['first_answer_at'] for row in times) - timedelta(seconds=1)
-                except ValueError:
-                    print(f"[Warning] No 'first_answer_at' timestamps for period '{period}'.")
-                    start = end - timedelta(days=30)  # Fallback: arbitrary 30-day window
-            else:
-                start = points[i - 1]
-        else:
-            raise ValueError("period must be 'day', 'week', or 'month'")
+        raise ValueError("period must be 'day', 'week', or 'month'")
+    return starts, ends
 
-        valid_prs = [row for row in times if start < row['first_answer_at'] <= end]
-        if valid_prs:
-            avg = np.mean([row['time_to_first_answer_hours'] if period == "day" else row['time_to_first_answer_hours'] / 24 for row in valid_prs])
-        else:
-            avg = np.nan
-        avg_times.append(avg)
-    return avg_times
-
-def rolling_avg_time_to_close(times, points, period):
-    if not times:
-        print(f"[Warning] No data available for time to close calculation in period '{period}'.")
-        return [np.nan] * len(points)
-
-    avg_times = []
-    for i, end in enumerate(points):
-        if period == "day":
-            start = end - timedelta(days=1)
-        elif period == "week":
-            start = end - timedelta(weeks=1)
-        elif period == "month":
-            if i == 0:
-                try:
-                    start = min(row['closed_at'] for row in times) - timedelta(seconds=1)
-                except ValueError:
-                    print(f"[Warning] No 'closed_at' timestamps for period '{period}'.")
-                    start = end - timedelta(days=30)  # Fallback: arbitrary 30-day window
-            else:
-                start = points[i - 1]
-        else:
-            raise ValueError("period must be 'day', 'week', or 'month'")
+def rolling_windows(times: np.ndarray, values: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                    aggs=("mean",)) -> dict:
+    """Aggregates of `values` over every window start < t <= end.
+
+    `times` (int64 ns) must be sorted ascending with `values` aligned to
+    them.  Window bounds come from two binary searches and count / sum /
+    mean from prefix sums, so any number of windows costs O(n log n); a
+    window holding a NaN value is NaN, as `np.mean` would give.  "median"
+    is taken from the window's slice of the sorted arrays.
+    """
+    lo = np.searchsorted(times, starts, side="right")
+    hi = np.searchsorted(times, ends, side="right")
+    n = hi - lo
+
+    missing = np.isnan(values)
+    # extended precision keeps the prefix differences exact to float64 for
+    # all practical sizes, so a window's sum does not drift with its offset
+    prefix = np.concatenate(([0], np.cumsum(np.where(missing, 0.0, values), dtype=np.longdouble)))
+    nans = np.concatenate(([0], np.cumsum(missing)))
+    sums = np.where(nans[hi] - nans[lo] > 0, np.nan, (prefix[hi] - prefix[lo]).astype(float))
 
-        valid_prs = [row for row in times if start < row['closed_at'] <= end]
-        if valid_prs:
-            avg = np.mean([row['time_to_close_hours'] if period == "day" else row['time_to_close_hours'] / 24 for row in valid_prs])
+    out = {}
+    for agg in aggs:
+        if agg == "count":
+            out[agg] = n
+        elif agg == "sum":
+            out[agg] = sums
+        elif agg == "mean":
+            out[agg] = np.where(n > 0, sums / np.maximum(n, 1), np.nan)
+        elif agg == "median":
+            out[agg] = np.array([np.median(values[a:b]) if b > a else np.nan for a, b in zip(lo, hi)])
         else:
-            avg = np.nan
-        avg_times.append(avg)
-    return avg_times
-
-def period_merge_rate(pulls_df, mask) -> float:
-        """
-        mask → boolean Series over pulls_df.
-        Returns % of those PRs (closed in period) that were merged, 2 decimals.
-        """
-        closed_cnt = mask.sum()
-        if closed_cnt == 0:
-            return 0.0
-        merged_cnt = pulls_df.loc[mask, "merged_at"].notna().sum()
-        return round((merged_cnt / closed_cnt) * 100, 2)
\ No newline at end of file
+            raise ValueError(f"unknown aggregate {agg!r}")
+    return out
+
+def sorted_events(rows: list, time_key: str, value_key: str) -> tuple[np.ndarray, np.ndarray]:
+    """(times, values) of `rows` sorted by `time_key`, rows without a timestamp dropped."""
+    stamps = pd.DatetimeIndex([row[time_key] for row in rows]).as_unit("ns")
+    values = np.array([row[value_key] for row in rows], dtype=float)
+    keep = ~stamps.isna()
+    times = stamps.asi8[keep]
+    order = np.argsort(times, kind="stable")
+    return times[order], values[keep][order]
+
+def sorted_stamps(ts: pd.Series) -> np.ndarray:
+    """Non‑NaT timestamps of `ts` as sorted int64 nanoseconds (UTC)."""
+    stamps = pd.DatetimeIndex(ts).as_unit("ns")
+    return np.sort(stamps.asi8[~stamps.isna()])
+
+def _as_ns(edges) -> np.ndarray:
+    edges = pd.DatetimeIndex(edges)
+    return (edges.tz_localize("UTC") if edges.tz is None else edges).as_unit("ns").asi8
+
+def bucket_counts(stamps: np.ndarray, edges, prefix: np.ndarray | None = None) -> np.ndarray:
+    """Events of the sorted `stamps` in every bucket [edges[i], edges[i + 1]).
+
+    `edges` are the boundaries of a `timeGrid` grid; each one is located
+    with a binary search, so any number of buckets costs O(k log n) once
+    the events are sorted.  With `prefix` (cumulative sums of a per‑event
+    weight, led by a 0) the weights are summed instead.
+    """
+    pos = np.searchsorted(stamps, _as_ns(edges), side="left")
+    return np.diff(pos if prefix is None else prefix[pos])
+
+def open_at(opened: np.ndarray, resolved: np.ndarray, points) -> np.ndarray:
+    """Items open at each of `points`: opened at or before it and not resolved by then.
+
+    `opened` and `resolved` are sorted int64 ns; an item counts as resolved
+    from max(created, closed), so rows closed "before" they were created
+    never enter the backlog.
+    """
+    ts = _as_ns(points)
+    return np.searchsorted(opened, ts, side="right") - np.searchsorted(resolved, ts, side="right")
@@ -11,7 +11,7 @@ convention used by `newcomers.py`.
 
 Required columns for the DataFrames (case‑sensitive):
     * `user`         – login / handle of the contributor
-    * `created_at`   – UTC timestamp (parseable by `pd.to_datetime`)
+    * `created_at`   – datetime64[ns, UTC], as typed by `utils.schema`
     * `labels`       – (for issues only) list *or* string representation
     * `state`        – (for issues only) 'open', 'closed', …
 
@@ -21,65 +21,23 @@ If additional columns are necessary, they are documented at function level.
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
 
+from utils.schema import require_datetime
+from utils.timeGrid import get_periods, run_as_of
+
 ###############################################################################
 # Constants & helpers
 ###############################################################################
 
-TODAY = datetime.now(timezone.utc)
 ONE_WEEK = timedelta(days=7)
 HALF_YEAR = timedelta(days=182)
 ONE_YEAR = timedelta(days=365)
 
-def get_periods(period: str = "day", *, n: int = 30, cutoff_days: int = 0) -> List[Tuple[datetime, datetime]]:
-    """Replica of newcomers.get_periods – returns `n` consecutive periods.
-
-    Args:
-        period: 'day' | 'week' | 'month'
-        n: number of periods to return *before* `cutoff_days`.
-        cutoff_days: gap between *now* and the most recent returned period;
-            lets you freeze data for incomplete current windows.
-    """
-    now = datetime.now(timezone.utc)
-    periods: List[Tuple[datetime, datetime]] = []
-
-    if period == "day":
-        today = now.date()
-        start_day = today - timedelta(days=cutoff_days + n)
-        for i in range(n):
-            start = start_day + timedelta(days=i)
-            end = start + timedelta(days=1)
-            periods.append((start, end))
-
-    elif period == "week":
-        this_monday = (now - timedelta(days=now.weekday())).date()
-        start_monday = this_monday - timedelta(weeks=cutoff_days // 7 + n)
-        for i in range(n):
-            start = start_monday + timedelta(weeks=i)
-            end = start + timedelta(weeks=1)
-            periods.append((start, end))
-
-    elif period == "month":
-        current = now.replace(day=1)
-        start_month = current - pd.DateOffset(months=cutoff_days // 30 + n)
-        current_month = pd.Timestamp(start_month)
-        for _ in range(n):
-            start = current_month.date()
-            end = (current_month + pd.offsets.MonthBegin(1)).date()
-            periods.append((start, end))
-            current_month += pd.offsets.MonthBegin(1)
-
-    else:
-        raise ValueError("Invalid period – use 'day', 'week', or 'month'.")
-
-    return periods
-
-
 def gini(array: Iterable[float | int]) -> float:
     """Calculate the Gini coefficient of a numpy array.
 
@@ -101,6 +59,89 @@ def gini(array: Iterable[float | int]) -> float:
     g = (n + 1 - 2 * np.sum(cum) / cum[-1]) / n
     return round(g, 4)
 
+###############################################################################
+# Activity index – who was active when, as bitsets of integer user ids
+###############################################################################
+
+DAY_NS = 86_400 * 10**9
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+def _ns(moment) -> int:
+    ts = pd.Timestamp(moment)
+    return (ts.tz_localize("UTC") if ts.tz is None else ts).as_unit("ns").value
+
+class ActivityIndex:
+    """Activity of every user in several sources (chat, code …) over time.
+
+    Logins of all sources share one integer id space, so the users active in
+    a window are a packed bitset (one bit per user) and set operations
+    between sources or windows are bitwise ones.  Each source keeps its
+    events sorted by time and, built on first use, a day × user bitmap over
+    the days it spans; a window on day boundaries is the OR of its days,
+    any other window is built from its slice of events.  Rows without a
+    user or a timestamp are left out.
+    """
+
+    def __init__(self, sources: dict[str, pd.DataFrame]) -> None:
+        valid = {}
+        for name, df in sources.items():
+            require_datetime(df, "created_at")
+            valid[name] = df.loc[df["user"].notna() & df["created_at"].notna(), ["user", "created_at"]]
+
+        logins = pd.concat([df["user"] for df in valid.values()], ignore_index=True) if valid else pd.Series(dtype=object)
+        codes, self.users = pd.factorize(logins)
+        self.n_bytes = (len(self.users) + 7) // 8
+
+        self._times, self._ids, self._bitmaps = {}, {}, {}
+        bounds = np.cumsum([0] + [len(df) for df in valid.values()])
+        for (name, df), a, b in zip(valid.items(), bounds[:-1], bounds[1:]):
+            stamps = pd.DatetimeIndex(df["created_at"]).as_unit("ns").asi8
+            order = np.argsort(stamps, kind="stable")
+            self._times[name], self._ids[name] = stamps[order], codes[a:b][order]
+
+    def empty(self) -> np.ndarray:
+        return np.zeros(self.n_bytes, dtype=np.uint8)
+
+    def _slice(self, source: str, start: int, end: int) -> np.ndarray:
+        lo, hi = np.searchsorted(self._times[source], [start, end], side="left")
+        mask = np.zeros(self.n_bytes * 8, dtype=bool)
+        mask[self._ids[source][lo:hi]] = True
+        return np.packbits(mask)
+
+    def _bitmap(self, source: str) -> tuple[int, np.ndarray]:
+        """(first day, days × bytes bitmap) of `source`, with a bit per user active on the day."""
+        if source not in self._bitmaps:
+            times, ids = self._times[source], self._ids[source]
+            days = times // DAY_NS
+            first = int(days[0]) if days.size else 0
+            bitmap = np.zeros((int(days[-1]) - first + 1 if days.size else 0, self.n_bytes), dtype=np.uint8)
+            np.bitwise_or.at(bitmap, (days - first, ids >> 3), (0x80 >> (ids & 7)).astype(np.uint8))
+            self._bitmaps[source] = first, bitmap
+        return self._bitmaps[source]
+
+    def active(self, source: str, start, end) -> np.ndarray:
+        """Bitset of the users with an event of `source` in [start, end)."""
+        start, end = _ns(start), _ns(end)
+        if start % DAY_NS or end % DAY_NS:
+            return self._slice(source, start, end)
+        first, bitmap = self._bitmap(source)
+        a = min(max(start // DAY_NS - first, 0), len(bitmap))
+        b = min(max(end // DAY_NS - first, 0), len(bitmap))
+        return np.bitwise_or.reduce(bitmap[a:b], axis=0) if b > a else self.empty()
+
+    def events(self, source: str) -> tuple[np.ndarray, np.ndarray]:
+        """(times, user ids) of the events of `source`, sorted by time."""
+        return self._times[source], self._ids[source]
+
+    @staticmethod
+    def count(bits: np.ndarray) -> int:
+        """Users set in `bits`."""
+        return int(_POPCOUNT[bits].sum())
+
+    def logins(self, bits: np.ndarray) -> np.ndarray:
+        """Logins of the users set in `bits`."""
+        return np.asarray(self.users)[np.flatnonzero(np.unpackbits(bits)[:len(self.users)])]
+
 ###############################################################################
 # Metric 1 – Active Chat Participation Rate (weekly)
 ###############################################################################
@@ -111,34 +152,31 @@ def metric_active_chat_participation_rate(
     pts: List[Tuple[datetime, datetime]],
     *,
     window: timedelta = ONE_WEEK,
+    index: ActivityIndex | None = None,
 ) -> List[dict]:
     """Share of code contributors who posted *≥1* chat message in last week.
 
-    chat_df   – columns: ['user', 'created_at']
-    contrib_df – code contributions (commits, PRs, etc.) with same columns.
-    pts        – periods generated by `get_periods` (granularity agnostic).
+    chat_df   – columns: ['user', 'created_at']
+    contrib_df – code contributions (commits, PRs, etc.) with same columns.
+    pts        – periods generated by `get_periods` (granularity agnostic).
+    index      – an `ActivityIndex` of the two frames (sources 'chat' and
+                 'code'), to share it between calls.
     """
-    chat_df['created_at'] = pd.to_datetime(chat_df['created_at'], utc=True)
-    contrib_df['created_at'] = pd.to_datetime(contrib_df['created_at'], utc=True)
+    index = index if index is not None else ActivityIndex({"chat": chat_df, "code": contrib_df})
 
     out: List[dict] = []
     for start_date, end_date in pts:
         end_ts = pd.Timestamp(end_date, tz='UTC')
         start_ts = end_ts - window
 
-        chat_users = (
-            chat_df.loc[(chat_df['created_at'] >= start_ts) & (chat_df['created_at'] < end_ts), 'user']
-            .unique()
-        )
-        code_users = (
-            contrib_df.loc[(contrib_df['created_at'] >= start_ts) & (contrib_df['created_at'] < end_ts), 'user']
-            .unique()
-        )
+        code_users = index.active("code", start_ts, end_ts)
+        n_code = index.count(code_users)
 
-        if code_users.size == 0:
+        if n_code == 0:
             rate = None
         else:
-            rate = round(len(np.intersect1d(chat_users, code_users)) / code_users.size * 100, 2)
+            both = index.active("chat", start_ts, end_ts) & code_users
+            rate = round(index.count(both) / n_code * 100, 2)
 
         out.append({"x": start_date.strftime('%Y-%m-%d'), "y": rate})
 
@@ -190,8 +228,8 @@ def metric_committer_churn_rate(
     if commit_df.empty:
         return None
 
-    commit_df['created_at'] = pd.to_datetime(commit_df['created_at'], utc=True)
-    as_of = as_of or TODAY
+    require_datetime(commit_df, 'created_at')
+    as_of = as_of or run_as_of()
 
     current_start = as_of - window_current
     prev_start = current_start - window_prev
@@ -219,7 +257,7 @@ def metric_committer_concentration_gini(
     if commit_df.empty:
         return None
 
-    commit_df['created_at'] = pd.to_datetime(commit_df['created_at'], utc=True)
+    require_datetime(commit_df, 'created_at')
     mask = (commit_df['created_at'] >= period_start) & (commit_df['created_at'] < period_end)
     window_df = commit_df.loc[mask]
     if window_df.empty:
@@ -237,7 +275,7 @@ def metric_contributor_growth_rate_yoy(contrib_df: pd.DataFrame) -> List[dict]:
     if contrib_df.empty:
         return []
 
-    contrib_df['created_at'] = pd.to_datetime(contrib_df['created_at'], utc=True)
+    require_datetime(contrib_df, 'created_at')
     contrib_df['year'] = contrib_df['created_at'].dt.year
 
     yearly_counts = contrib_df.groupby('year')['user'].nunique().sort_index()
@@ -268,8 +306,8 @@ def metric_count_of_occasional_contributors(
     if contrib_df.empty:
         return None
 
-    contrib_df['created_at'] = pd.to_datetime(contrib_df['created_at'], utc=True)
-    as_of = as_of or TODAY
+    require_datetime(contrib_df, 'created_at')
+    as_of = as_of or run_as_of()
     window_start = as_of - window
 
     window_df = contrib_df.loc[
@@ -318,13 +356,10 @@ def metric_count_of_occasional_contributors(
     if contrib_df.empty:
         return None  # nothing to compute
 
-    # --- ensure created_at is timezone‑aware datetime -------------------- #
-    contrib_df = contrib_df.copy()
-    contrib_df["created_at"] = pd.to_datetime(
-        contrib_df["created_at"], errors="coerce", utc=True
-    )
+    # --- created_at must be a timezone‑aware datetime ------------------- #
+    require_datetime(contrib_df, "created_at")
 
-    as_of = as_of or TODAY
+    as_of = as_of or run_as_of()
     window_start = as_of - window
 
     # --- slice to trailing window --------------------------------------- #
@@ -342,3 +377,51 @@ def metric_count_of_occasional_contributors(
     # --- contributors with ≤ k events ----------------------------------- #
     occasional = contrib_counts[contrib_counts <= k].size
     return int(occasional)
+
+###############################################################################
+# Metric 7 – Occasional Contributors per period (sliding window)
+###############################################################################
+
+def metric_occasional_contributors_series(
+    contrib_df: pd.DataFrame,
+    pts: List[Tuple[datetime, datetime]],
+    *,
+    k: int = 2,
+    window: timedelta = ONE_YEAR,
+    index: ActivityIndex | None = None,
+    source: str = "code",
+) -> List[dict]:
+    """Contributors active in each period with ≤ *k* contributions in the *window* before its end.
+
+    The periods are swept in order of their end while a per‑user counter of
+    the trailing window is updated with the contributions entering and
+    leaving it, so every contribution is counted in and out once per series
+    instead of the window being rescanned for every period.
+
+    contrib_df – columns: ['user', 'created_at']
+    index      – an `ActivityIndex` holding `contrib_df` as `source`, to
+                 share it between calls.
+    """
+    index = index if index is not None else ActivityIndex({source: contrib_df})
+    times, ids = index.events(source)
+    counts = np.zeros(len(index.users), dtype=np.int64)
+    span = pd.Timedelta(window).value
+
+    starts = np.array([_ns(pd.Timestamp(start, tz='UTC')) for start, _ in pts], dtype=np.int64)
+    ends = np.array([_ns(pd.Timestamp(end, tz='UTC')) for _, end in pts], dtype=np.int64)
+    entered = np.searchsorted(times, ends, side="left")
+    left = np.searchsorted(times, ends - span, side="left")
+    firsts = np.searchsorted(times, starts, side="left")
+
+    ys = [0] * len(pts)
+    added = removed = 0
+    for i in np.argsort(ends, kind="stable"):
+        np.add.at(counts, ids[added:entered[i]], 1)
+        added = max(added, entered[i])
+        np.subtract.at(counts, ids[removed:left[i]], 1)
+        removed = max(removed, left[i])
+
+        active = counts[np.unique(ids[firsts[i]:entered[i]])]
+        ys[i] = int(np.count_nonzero((active >= 1) & (active <= k)))
+
+    return [{"x": start.strftime('%Y-%m-%d'), "y": y} for (start, _), y in zip(pts, ys)]
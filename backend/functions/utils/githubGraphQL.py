@@ -0,0 +1,404 @@
+"""githubGraphQL.py – bulk GraphQL extraction backend.
+
+The REST extractors issue one listing call, one detail call per PR and one
+comment listing per item.  The queries
+below fetch 100 issues / PRs per request together with their labels,
+assignees, comments and reaction summaries, and only fall back to follow‑up
+queries for the rare item whose comments overflow the embedded page.
+
+`fetch_issue_rows` and `fetch_pull_rows` return rows with exactly the keys
+and value types the REST extractors produce, so everything downstream of the
+extractors is backend‑agnostic.
+
+`GraphQLTransport` talks to the live API, to any compatible server given by
+`api_url` (e.g. a local mock), or records / replays JSON fixtures so the
+backend can be exercised offline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from utils.rateLimit import resource_for_path, scheduler_for
+from utils.reactions import counts_from_groups, expand
+
+API_URL = "https://api.github.com"
+PAGE_SIZE = 100
+
+###############################################################################
+# Transport
+###############################################################################
+
+class GraphQLTransport:
+    """POSTs GraphQL queries (and the odd REST GET) to GitHub.
+
+    mode:
+        'live'   – talk to `api_url` only.
+        'record' – talk to `api_url` and save every response under `fixtures`.
+        'replay' – answer from `fixtures` only; no network, no token needed.
+    """
+
+    def __init__(
+        self,
+        token: str | None = None,
+        *,
+        api_url: str = API_URL,
+        graphql_url: str | None = None,
+        fixtures: str | Path | None = None,
+        mode: str = "live",
+        timeout: int = 60,
+    ) -> None:
+        if mode not in ("live", "record", "replay"):
+            raise ValueError("mode must be 'live', 'record' or 'replay'")
+        if mode != "live" and fixtures is None:
+            raise ValueError(f"mode '{mode}' needs a fixtures directory")
+
+        self.api_url = api_url.rstrip("/")
+        self.graphql_url = graphql_url or f"{self.api_url}/graphql"
+        self.fixtures = Path(fixtures) if fixtures is not None else None
+        self.mode = mode
+        self.timeout = timeout
+        self.scheduler = scheduler_for(token)
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"bearer {token}"
+
+        if self.mode == "record":
+            self.fixtures.mkdir(parents=True, exist_ok=True)
+
+    def query(self, query: str, variables: dict[str, Any]) -> dict:
+        payload = {"query": query, "variables": variables}
+        body = self._send("POST", "/graphql", payload)
+        if body.get("errors"):
+            messages = "; ".join(e.get("message", str(e)) for e in body["errors"])
+            raise RuntimeError(f"GraphQL error: {messages}")
+        return body["data"]
+
+    def rest_get(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        return self._send("GET", path, params or {})
+
+    def _fixture_path(self, method: str, path: str, payload: dict) -> Path:
+        key = json.dumps({"method": method, "path": path, "payload": payload}, sort_keys=True)
+        return self.fixtures / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json"
+
+    def _send(self, method: str, path: str, payload: dict) -> Any:
+        if self.mode == "replay":
+            fixture = self._fixture_path(method, path, payload)
+            if not fixture.exists():
+                raise FileNotFoundError(f"No recorded fixture for {method} {path} {payload} ({fixture.name})")
+            with fixture.open(encoding="utf-8") as fh:
+                return json.load(fh)
+
+        resource = resource_for_path(path)
+        self.scheduler.acquire(resource)
+        if method == "POST":
+            resp = self.session.post(self.graphql_url, json=payload, timeout=self.timeout)
+        else:
+            resp = self.session.get(f"{self.api_url}{path}", params=payload, timeout=self.timeout)
+        self.scheduler.update(resp.headers, resp.status_code, resource)
+        resp.raise_for_status()
+        body = resp.json()
+
+        if self.mode == "record":
+            with self._fixture_path(method, path, payload).open("w", encoding="utf-8") as fh:
+                json.dump(body, fh, indent=1)
+        return body
+
+###############################################################################
+# Queries
+###############################################################################
+
+_PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+_REACTIONS = "reactionGroups { content reactors { totalCount } }"
+
+_REVIEW_COMMENT_FIELDS = f"""
+    databaseId author {{ login }} createdAt path position
+    commit {{ oid }} replyTo {{ databaseId }} body {_REACTIONS}
+"""
+
+_ISSUE_COMMENT_FIELDS = f"databaseId author {{ login }} createdAt body {_REACTIONS}"
+
+_PULL_FIELDS = f"""
+    id databaseId number title body
+    createdAt updatedAt closedAt mergedAt
+    state isDraft mergeable mergeStateStatus merged canBeRebased
+    commits {{ totalCount }} additions deletions changedFiles
+    author {{ login }}
+    assignees(first: 100) {{ nodes {{ login }} }}
+    reviewRequests(first: 100) {{ nodes {{ requestedReviewer {{ ... on User {{ login }} }} }} }}
+    mergedBy {{ ... on User {{ email }} }}
+    labels(first: 100) {{ nodes {{ name }} }}
+    milestone {{ number }}
+    reviewThreads(first: 20) {{
+        {_PAGE_INFO}
+        nodes {{ id comments(first: 20) {{ {_PAGE_INFO} nodes {{ {_REVIEW_COMMENT_FIELDS} }} }} }}
+    }}
+"""
+
+_ISSUE_FIELDS = f"""
+    id databaseId number url title body
+    createdAt updatedAt closedAt
+    state locked
+    author {{ login }}
+    labels(first: 100) {{ nodes {{ name }} }}
+    milestone {{ title }}
+    assignees(first: 100) {{ nodes {{ login }} }}
+    comments(first: 30) {{ totalCount {_PAGE_INFO} nodes {{ {_ISSUE_COMMENT_FIELDS} }} }}
+    {_REACTIONS}
+"""
+
+def _listing_query(connection: str, fields: str | None) -> str:
+    nodes = f"nodes {{ {fields} }}" if fields else ""
+    return f"""
+query($owner: String!, $name: String!, $first: Int!, $after: String) {{
+  repository(owner: $owner, name: $name) {{
+    {connection}(first: $first, after: $after, orderBy: {{field: CREATED_AT, direction: DESC}}) {{
+      {_PAGE_INFO}
+      {nodes}
+    }}
+  }}
+}}"""
+
+PULLS_QUERY = _listing_query("pullRequests", _PULL_FIELDS)
+PULL_CURSORS_QUERY = _listing_query("pullRequests", None)
+ISSUES_QUERY = _listing_query("issues", _ISSUE_FIELDS)
+ISSUE_CURSORS_QUERY = _listing_query("issues", None)
+
+REVIEW_THREADS_QUERY = f"""
+query($id: ID!, $after: String) {{
+  node(id: $id) {{
+    ... on PullRequest {{
+      reviewThreads(first: 100, after: $after) {{
+        {_PAGE_INFO}
+        nodes {{ id comments(first: 100) {{ {_PAGE_INFO} nodes {{ {_REVIEW_COMMENT_FIELDS} }} }} }}
+      }}
+    }}
+  }}
+}}"""
+
+THREAD_COMMENTS_QUERY = f"""
+query($id: ID!, $after: String) {{
+  node(id: $id) {{
+    ... on PullRequestReviewThread {{
+      comments(first: 100, after: $after) {{ {_PAGE_INFO} nodes {{ {_REVIEW_COMMENT_FIELDS} }} }}
+    }}
+  }}
+}}"""
+
+ISSUE_COMMENTS_QUERY = f"""
+query($id: ID!, $after: String) {{
+  node(id: $id) {{
+    ... on Issue {{
+      comments(first: 100, after: $after) {{ {_PAGE_INFO} nodes {{ {_ISSUE_COMMENT_FIELDS} }} }}
+    }}
+  }}
+}}"""
+
+###############################################################################
+# Pagination helpers
+###############################################################################
+
+def _paginate(transport: GraphQLTransport, query: str, cursor_query: str, connection: str,
+              owner: str, name: str, start: int, stop: int | None):
+    """Yield listing nodes with index in [start, stop).
+
+    Whole pages before `start` are skipped with a cursor‑only query, so an
+    offset costs one cheap request per 100 items instead of a full page.
+    """
+    variables = {"owner": owner, "name": name, "first": PAGE_SIZE, "after": None}
+    index = 0
+
+    while index + PAGE_SIZE <= start:
+        page = transport.query(cursor_query, variables)["repository"][connection]
+        index += PAGE_SIZE
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        variables["after"] = page["pageInfo"]["endCursor"]
+
+    while True:
+        page = transport.query(query, variables)["repository"][connection]
+        for node in page["nodes"]:
+            if stop is not None and index >= stop:
+                return
+            if index >= start:
+                yield node
+            index += 1
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        variables["after"] = page["pageInfo"]["endCursor"]
+
+def _rest_of_connection(transport: GraphQLTransport, query: str, node_id: str, field: str, conn: dict) -> list:
+    """Return all nodes of `conn`, fetching the pages after the embedded one."""
+    nodes = list(conn["nodes"])
+    info = conn["pageInfo"]
+    while info["hasNextPage"]:
+        page = transport.query(query, {"id": node_id, "after": info["endCursor"]})["node"][field]
+        nodes.extend(page["nodes"])
+        info = page["pageInfo"]
+    return nodes
+
+###############################################################################
+# Row mapping (mirrors the REST extractors)
+###############################################################################
+
+def _ts(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+def _login(actor: dict | None) -> str:
+    return actor["login"] if actor else "ghost"
+
+_MERGEABLE = {"MERGEABLE": True, "CONFLICTING": False}
+
+def _milestone_ids(transport: GraphQLTransport, owner: str, name: str) -> dict:
+    """Milestone number → REST id (GraphQL milestones carry no database id)."""
+    ids, page = {}, 1
+    while True:
+        batch = transport.rest_get(f"/repos/{owner}/{name}/milestones", {"state": "all", "per_page": 100, "page": page})
+        if not batch:
+            return ids
+        ids.update({m["number"]: m["id"] for m in batch})
+        page += 1
+
+def _pull_row(node: dict, milestone_ids: dict) -> dict:
+    merged_by = node.get("mergedBy") or {}
+    return {
+        # IDENTITY
+        "number": node["number"],
+        "id":     node["databaseId"],
+
+        # TEXT
+        "title": node["title"],
+        "body":  node["body"],
+
+        # TIMESTAMPS
+        "created_at": _ts(node["createdAt"]),
+        "updated_at": _ts(node["updatedAt"]),
+        "closed_at":  _ts(node["closedAt"]),
+        "merged_at":  _ts(node["mergedAt"]),
+
+        # STATE / REVIEW
+        "state":           "open" if node["state"] == "OPEN" else "closed",
+        "draft":           node["isDraft"],
+        "mergeable":       _MERGEABLE.get(node["mergeable"]),
+        "mergeable_state": (node["mergeStateStatus"] or "unknown").lower(),
+        "merged":          node["merged"],
+        # REST leaves rebaseable null while mergeability is unknown (e.g. closed PRs)
+        "rebaseable":      node["canBeRebased"] if node["mergeable"] in _MERGEABLE else None,
+
+        # COUNTS
+        "commits":       node["commits"]["totalCount"],
+        "additions":     node["additions"],
+        "deletions":     node["deletions"],
+        "changed_files": node["changedFiles"],
+
+        # USERS & REFS
+        "user":                 _login(node["author"]),
+        "assignees":            [u["login"] for u in node["assignees"]["nodes"]],
+        "requested_reviewers":  [r["requestedReviewer"]["login"] for r in node["reviewRequests"]["nodes"]
+                                 if r.get("requestedReviewer") and "login" in r["requestedReviewer"]],
+        "merged_by":            merged_by.get("email") or None,
+
+        # LABELS & MILESTONE
+        "labels":    [lbl["name"] for lbl in node["labels"]["nodes"]],
+        "milestone": milestone_ids.get(node["milestone"]["number"]) if node.get("milestone") else None,
+    }
+
+def _review_comment_row(pr_number: int, c: dict) -> dict:
+    counts = counts_from_groups(c["reactionGroups"])
+    return {
+        "pr_number":  pr_number,
+        "id":         c["databaseId"],
+        "user":       _login(c["author"]),
+        "created_at": _ts(c["createdAt"]),
+        "path":       c["path"],
+        "position":   c["position"],
+        "commit_id":  (c.get("commit") or {}).get("oid"),
+        "in_reply_to_id": (c.get("replyTo") or {}).get("databaseId"),
+        "body":       c["body"],
+        "reactions":        expand(counts),
+        "reaction_counts":  counts,
+    }
+
+def _review_comments(transport: GraphQLTransport, node: dict) -> list:
+    threads = _rest_of_connection(transport, REVIEW_THREADS_QUERY, node["id"], "reviewThreads", node["reviewThreads"])
+    comments = []
+    for thread in threads:
+        comments.extend(_rest_of_connection(transport, THREAD_COMMENTS_QUERY, thread["id"], "comments", thread["comments"]))
+    # the REST endpoint lists review comments in id order
+    return sorted(comments, key=lambda c: c["databaseId"])
+
+def fetch_pull_rows(transport: GraphQLTransport, owner: str, name: str,
+                    min_pull: int = 0, max_pull: int | None = None) -> tuple[list, list]:
+    """Return (pull_rows, comment_rows) for PRs [min_pull, max_pull) in REST listing order."""
+    milestone_ids = _milestone_ids(transport, owner, name)
+    pull_rows, comment_rows = [], []
+
+    for node in _paginate(transport, PULLS_QUERY, PULL_CURSORS_QUERY, "pullRequests", owner, name, min_pull, max_pull):
+        pull_rows.append(_pull_row(node, milestone_ids))
+        comment_rows.extend(_review_comment_row(node["number"], c) for c in _review_comments(transport, node))
+
+    return pull_rows, comment_rows
+
+def _issue_row(node: dict) -> dict:
+    return {
+        # IDENTITY
+        "number":     node["number"],
+        "id":         node["databaseId"],
+        "html_url":   node["url"],
+
+        # TEXT
+        "title":      node["title"],
+        "body":       node["body"],
+
+        # TIMESTAMPS
+        "created_at": _ts(node["createdAt"]),
+        "updated_at": _ts(node["updatedAt"]),
+        "closed_at":  _ts(node["closedAt"]),
+
+        # STATE / REVIEW
+        "state":      node["state"].lower(),
+        "locked":     node["locked"],
+        "author":     _login(node["author"]),
+
+        # labels & milestone
+        "labels":     [lbl["name"] for lbl in node["labels"]["nodes"]],
+        "milestone":  (node.get("milestone") or {}).get("title"),
+
+        # USERS & REFS
+        "assignees":  [u["login"] for u in node["assignees"]["nodes"]],
+        "comments":   node["comments"]["totalCount"],
+        "reactions":  counts_from_groups(node["reactionGroups"]),
+    }
+
+def _issue_comment_row(issue_number: int, c: dict) -> dict:
+    return {
+        "issue_number": issue_number,
+        "comment_id": c["databaseId"],
+        "user": _login(c["author"]),
+        "created_at": _ts(c["createdAt"]),
+        "body": c["body"],
+        "reactions": counts_from_groups(c["reactionGroups"]),
+    }
+
+def fetch_issue_rows(transport: GraphQLTransport, owner: str, name: str,
+                     min_issues: int = 0, max_issues: int | None = None) -> tuple[list, list]:
+    """Return (issue_rows, comment_rows) for issues [min_issues, max_issues) in REST listing order.
+
+    The GraphQL `issues` connection never contains pull requests, which
+    matches the REST extractor skipping them before it counts.
+    """
+    issue_rows, comment_rows = [], []
+
+    for node in _paginate(transport, ISSUES_QUERY, ISSUE_CURSORS_QUERY, "issues", owner, name, min_issues, max_issues):
+        issue_rows.append(_issue_row(node))
+        comments = _rest_of_connection(transport, ISSUE_COMMENTS_QUERY, node["id"], "comments", node["comments"])
+        comment_rows.extend(_issue_comment_row(node["number"], c) for c in comments)
+
+    return issue_rows, comment_rows
@@ -0,0 +1,154 @@
+"""githubHttp.py – HTTP plumbing shared by the extractors.
+
+PyGithub keeps one persistent connection object per `Github` instance and
+stores the pending request on it, so two threads issuing requests through the
+same instance can swap each other's responses.  `use_shared_sessions()`
+injects connection classes that are created per request (PyGithub's
+non‑persistent mode) but reuse one pooled `requests.Session` per host, which
+keeps keep‑alive connections while making concurrent requests safe.  The
+same connection classes ask `utils.rateLimit` for a slot before each request
+and feed the response's rate‑limit headers back to it, and revalidate GETs
+against `utils.httpCache` when it is enabled.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+import requests
+
+from github import Auth, Github
+from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass, Requester
+from utils.httpCache import http_cache
+from utils.rateLimit import resource_for_path, scheduler_for
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_SESSIONS: dict[tuple, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+_POOL_SIZE = requests.adapters.DEFAULT_POOLSIZE
+
+def _mount(session: requests.Session, protocol: str, retry) -> None:
+    session.mount(f"{protocol}://", requests.adapters.HTTPAdapter(
+        max_retries=retry if retry is not None else requests.adapters.DEFAULT_RETRIES,
+        pool_connections=_POOL_SIZE,
+        pool_maxsize=_POOL_SIZE,
+    ))
+
+def _shared_session(protocol: str, host: str, port: int, retry) -> requests.Session:
+    key = (protocol, host, port)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            session.auth = Requester.noopAuth
+            session.pool_size = _POOL_SIZE
+            _mount(session, protocol, retry)
+            _SESSIONS[key] = session
+        elif session.pool_size < _POOL_SIZE:
+            session.pool_size = _POOL_SIZE
+            _mount(session, protocol, retry)
+        return session
+
+def _token_of(headers: dict) -> str | None:
+    auth = headers.get("Authorization") or headers.get("authorization")
+    return auth.split()[-1] if auth else None
+
+class _SharedConnection:
+    """Per‑request connection over a shared session, paced by the token's scheduler
+    and answered from the HTTP cache when GitHub reports a page unchanged."""
+
+    def _setup(self, protocol, host, port, timeout, retry, pool_size, kwargs) -> None:
+        self.port = port
+        self.host = host
+        self.protocol = protocol
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.retry = retry
+        self.pool_size = pool_size
+        self.session = _shared_session(protocol, host, port, retry)
+
+    def getresponse(self):
+        cache = http_cache() if self.verb == "GET" and not self.stream else None
+        if cache is not None:
+            url = f"{self.protocol}://{self.host}:{self.port}{self.url}"
+            key_headers = self.headers
+            entry = cache.lookup(url, key_headers)
+            if entry is not None:
+                self.headers = {**self.headers, **cache.conditional_headers(entry)}
+
+        # a revalidation answered 304 is free, so it is neither paced nor counted up front
+        conditional = cache is not None and entry is not None
+        scheduler = scheduler_for(_token_of(self.headers))
+        resource = resource_for_path(self.url.split("?")[0])
+        scheduler.acquire(resource, conditional)
+        response = super().getresponse()
+        scheduler.update(response.headers, response.status, resource, conditional)
+
+        if cache is not None:
+            if response.status == 304 and entry is not None:
+                return cache.revalidated(url, key_headers, entry, response.headers)
+            cache.store(url, key_headers, response)
+        return response
+
+    def close(self) -> None:
+        # the session outlives the per‑request connection object
+        pass
+
+class SharedHTTPSConnection(_SharedConnection, HTTPSRequestsConnectionClass):
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self._setup("https", host, port or 443, timeout, retry, pool_size, kwargs)
+
+class SharedHTTPConnection(_SharedConnection, HTTPRequestsConnectionClass):
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self._setup("http", host, port or 80, timeout, retry, pool_size, kwargs)
+
+def use_shared_sessions(pool_size: int | None = None) -> None:
+    """Make every `Github` instance in this process thread‑safe to share and
+    route its requests through the rate‑limit scheduler."""
+    global _POOL_SIZE
+    if pool_size:
+        _POOL_SIZE = max(_POOL_SIZE, pool_size)
+    Requester.injectConnectionClasses(SharedHTTPConnection, SharedHTTPSConnection)
+
+_CLIENTS: dict[str, Github] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+def get_github(api_key: str, *, pool_size: int | None = None) -> Github:
+    """The process‑wide `Github` client of `api_key`.
+
+    Every extractor builds its client here, so all of them share the same
+    connection pool and rate‑limit budget.
+    """
+    use_shared_sessions(pool_size)
+    with _CLIENTS_LOCK:
+        if api_key not in _CLIENTS:
+            _CLIENTS[api_key] = Github(auth=Auth.Token(api_key), pool_size=_POOL_SIZE)
+        return _CLIENTS[api_key]
+
+def fetch_in_order(fn: Callable[[T], R], items: Iterable[T], workers: int = 8) -> Iterator[R]:
+    """Yield `fn(item)` for every item, in input order, with at most `workers`
+    calls running at once.
+
+    At most ``2 * workers`` items are pulled from `items` ahead of the result
+    being yielded, so a lazily paginated listing is not drained up front.
+    """
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    window = 2 * workers
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,154 @@
+"""httpCache.py – on‑disk cache of GitHub REST responses.
+
+Successful GETs that carry an ETag or Last‑Modified header are stored under
+``files/http_cache/`` keyed by URL (plus token and Accept header, which
+change what GitHub returns).  The next request for the same URL is sent
+with If‑None‑Match / If‑Modified‑Since; GitHub answers 304 for unchanged
+pages, which does not count against the rate limit, and the stored body is
+handed to PyGithub instead.  The directory is kept under `max_bytes` by
+evicting the least recently used entries.
+
+The cache is enabled per process with `enable_http_cache` and used by the
+connection classes of `utils.githubHttp`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+
+from pathlib import Path
+
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "files" / "http_cache"
+DEFAULT_CACHE_MB = 512
+
+# headers of a 304 that replace the stored ones
+_FRESH_HEADERS = ("date", "etag", "last-modified")
+
+class CachedResponse:
+    """Stands in for PyGithub's RequestsResponse when a 304 revalidates a stored body."""
+
+    def __init__(self, status: int, headers: CaseInsensitiveDict, body: str) -> None:
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self) -> str:
+        return self._body
+
+class HttpCache:
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MB * 2**20) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = {p.name: p.stat().st_size for p in self.dir.glob("*.json")}
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_served = 0
+
+    def _path(self, url: str, headers: dict) -> Path:
+        headers = CaseInsensitiveDict(headers)
+        key = json.dumps([url, headers.get("Authorization", ""), headers.get("Accept", "")])
+        return self.dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def lookup(self, url: str, headers: dict) -> dict | None:
+        path = self._path(url, headers)
+        try:
+            with path.open(encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = CaseInsensitiveDict(entry["headers"])
+        conditions = {}
+        if "etag" in headers:
+            conditions["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            conditions["If-Modified-Since"] = headers["last-modified"]
+        return conditions
+
+    def revalidated(self, url: str, request_headers: dict, entry: dict, fresh_headers) -> CachedResponse:
+        """The stored response for a 304, with the 304's rate‑limit headers."""
+        headers = CaseInsensitiveDict(entry["headers"])
+        for name, value in fresh_headers.items():
+            if name.lower().startswith("x-ratelimit") or name.lower() in _FRESH_HEADERS:
+                headers[name] = value
+
+        path = self._path(url, request_headers)
+        try:
+            os.utime(path)          # mark as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            self.bytes_served += len(entry["body"])
+        return CachedResponse(entry["status"], headers, entry["body"])
+
+    def store(self, url: str, request_headers: dict, response) -> None:
+        """Keep a 200 response that GitHub can revalidate."""
+        with self._lock:
+            self.misses += 1
+        headers = dict(response.getheaders())
+        lowered = {k.lower() for k in headers}
+        if response.status != 200 or not lowered & {"etag", "last-modified"}:
+            return
+
+        entry = {"url": url, "status": response.status, "headers": headers, "body": response.read()}
+        path = self._path(url, request_headers)
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self.stores += 1
+            self._sizes[path.name] = path.stat().st_size
+            if sum(self._sizes.values()) > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries down to 90 % of the limit (under the lock)."""
+        def _mtime(name):
+            try:
+                return (self.dir / name).stat().st_mtime
+            except OSError:
+                return 0.0
+
+        total = sum(self._sizes.values())
+        for name in sorted(self._sizes, key=_mtime):
+            if total <= 0.9 * self.max_bytes:
+                break
+            (self.dir / name).unlink(missing_ok=True)
+            total -= self._sizes.pop(name)
+            self.evictions += 1
+
+    def report(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (f"HTTP cache: {self.hits}/{total} GETs answered 304 ({rate:.0%}), "
+                f"{self.bytes_served / 2**20:.1f} MB served from disk, {self.stores} stored, "
+                f"{self.evictions} evicted, {sum(self._sizes.values()) / 2**20:.1f} MB on disk")
+
+_CACHE: HttpCache | None = None
+
+def enable_http_cache(directory: Path = DEFAULT_CACHE_DIR, max_mb: int = DEFAULT_CACHE_MB) -> HttpCache:
+    """Cache the GitHub GETs of this process in `directory`."""
+    global _CACHE
+    _CACHE = HttpCache(directory, max_mb * 2**20)
+    return _CACHE
+
+def http_cache() -> HttpCache | None:
+    return _CACHE
@@ -0,0 +1,80 @@
+"""incremental.py – high‑water‑mark bookkeeping for nightly extraction runs.
+
+Each repository keeps one small JSON file next to its datasets,
+``files/<org>_<repo>_watermark.json``, holding the latest `updated_at` seen
+per dataset kind (``issues``, ``pulls``).  Extractors ask GitHub only for
+items updated since that mark and upsert them into the existing dataset.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+def watermark_path(out_dir: Path, org_name: str, repo_name: str) -> Path:
+    return Path(out_dir) / f"{org_name.lower()}_{repo_name.lower()}_watermark.json"
+
+def load_watermark(path: Path, kind: str) -> datetime | None:
+    """Return the stored high‑water mark for `kind`, or None on first run."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open(encoding="utf-8") as fh:
+        value = json.load(fh).get(kind)
+    return datetime.fromisoformat(value) if value else None
+
+def save_watermark(path: Path, kind: str, ts: datetime | None) -> None:
+    """Persist `ts` for `kind`, keeping the marks of the other kinds."""
+    if ts is None:
+        return
+    path = Path(path)
+    marks = {}
+    if path.exists():
+        with path.open(encoding="utf-8") as fh:
+            marks = json.load(fh)
+    marks[kind] = ts.isoformat()
+
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(marks, fh, indent=2)
+    os.replace(tmp, path)
+
+def _align_dtypes(existing: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """Parse timestamp columns of datasets written by older (all‑string) runs."""
+    for col in fresh.columns:
+        if col in existing.columns and pd.api.types.is_datetime64_any_dtype(fresh[col]) \
+                and not pd.api.types.is_datetime64_any_dtype(existing[col]):
+            existing = existing.assign(**{col: pd.to_datetime(existing[col], utc=True, errors="coerce")})
+    return existing
+
+def upsert_rows(existing: pd.DataFrame, fresh: pd.DataFrame, key: str = "id") -> pd.DataFrame:
+    """Replace rows of `existing` whose `key` appears in `fresh`, append the rest."""
+    if existing.empty:
+        return fresh.reset_index(drop=True)
+    if fresh.empty:
+        return existing.reset_index(drop=True)
+
+    existing = _align_dtypes(existing, fresh)
+    fresh_keys = set(fresh[key].astype(str))
+    kept = existing[~existing[key].astype(str).isin(fresh_keys)]
+    return pd.concat([kept, fresh], ignore_index=True)
+
+def replace_children(existing: pd.DataFrame, fresh: pd.DataFrame, parent_col: str, parents: Iterable) -> pd.DataFrame:
+    """Drop every child row (e.g. comments) of the refreshed `parents`, then append `fresh`.
+
+    Comments of an updated item are re‑fetched in full, so replacing the whole
+    group also removes comments that were deleted upstream.
+    """
+    parents = {str(p) for p in parents}
+    if existing.empty:
+        return fresh.reset_index(drop=True)
+
+    existing = _align_dtypes(existing, fresh)
+    kept = existing[~existing[parent_col].astype(str).isin(parents)]
+    return pd.concat([kept, fresh], ignore_index=True)
@@ -1,137 +1,168 @@
-from datetime import datetime, timezone, timedelta
-from pathlib import Path
-from glob import glob
+from datetime import timedelta
 from utils.dataCleaning import *
+from utils.schema import require_datetime
+from utils.timeGrid import get_periods
 
-import argparse, json, math
 import numpy as np
 import pandas as pd
 
-LOOKAHEAD_90D = timedelta(days=90)
-LOOKAHEAD_6M = timedelta(days=182)
-SUSTAINED_N = 4
-TODAY = datetime.now(timezone.utc)
-
-def get_periods(period='day', n=30, cutoff_days=0):
-    now = datetime.now(timezone.utc)
-    periods = []
-
-    if period == 'day':
-        today = now.date()
-        start_day = today - timedelta(days=cutoff_days + n)
-        for i in range(n):
-            start = start_day + timedelta(days=i)
-            end = start + timedelta(days=1)
-            periods.append((start, end))
-
-    elif period == 'week':
-        this_monday = (now - timedelta(days=now.weekday())).date()
-        start_monday = this_monday - timedelta(weeks=cutoff_days // 7 + n)
-        for i in range(n):
-            start = start_monday + timedelta(weeks=i)
-            end = start + timedelta(weeks=1)
-            periods.append((start, end))
-
-    elif period == 'month':
-        current = now.replace(day=1)
-        start_month = current - pd.DateOffset(months=cutoff_days // 30 + n)
-        current_month = pd.Timestamp(start_month)
-        for _ in range(n):
-            start = (current_month).date()
-            end = (current_month + pd.offsets.MonthBegin(1)).date()
-            periods.append((start, end))
-            current_month += pd.offsets.MonthBegin(1)
-
-    else:
-        raise ValueError("Invalid period")
-
-    return periods
-
+DAY_NS = 86_400 * 10**9
+NAT_NS = np.iinfo(np.int64).min
+RETENTION_LOOKAHEADS = {"30d": timedelta(days=30), "90d": timedelta(days=90), "180d": timedelta(days=180)}
 
 def first_contribution(df: pd.DataFrame, date_col="created_at"):
     return df.groupby("user")[date_col].min()
 
-def metric_newcomers_count(contrib_df, pts):
-    out = []
-    first_dates = pd\
-        .to_datetime(first_contribution(contrib_df))\
-        .apply(lambda dt: dt.timestamp())
-
-    for start_date, end_date in pts:
-        start_ts, end_ts = pd.Timestamp(start_date).timestamp(), pd.Timestamp(end_date).timestamp()
-        count = first_dates[
-            (first_dates >= start_ts) & 
-            (first_dates <= end_ts)
-        ].size
-
-        out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": count })
-
+def metric_newcomers_count(contrib_df, pts, index=None):
+    """Users whose first contribution falls in each bucket [start, end) of `pts`."""
+    index = index if index is not None else ContributionIndex(contrib_df)
+    counts = index.cohort_histogram(_edges_ns(pts))
+    return [{ "x": start_date.strftime('%Y-%m-%d'), "y": int(count) } for (start_date, _), count in zip(pts, counts)]
+
+class ContributionIndex:
+    """Every user's contributions, sorted once, for cohort lookups.
+
+    `times` holds the contribution timestamps (int64 ns) grouped by user;
+    user i owns ``times[offsets[i]:offsets[i + 1]]``, in time order.  Users
+    are ordered by their first contribution, so the cohort first contributing
+    in [start, end) is the slice of users found by two binary searches.
+    `counts`, `first`, `second` (NaT for single contributions) and `last`
+    form the per‑user table the cohort metrics share.  Rows without a user
+    or a timestamp are left out, as `groupby` and the date masks did.
+    """
+
+    def __init__(self, contrib_df: pd.DataFrame, date_col: str = "created_at") -> None:
+        require_datetime(contrib_df, date_col)
+        valid = contrib_df["user"].notna() & contrib_df[date_col].notna()
+        codes, users = pd.factorize(contrib_df.loc[valid, "user"])
+        stamps = pd.DatetimeIndex(contrib_df.loc[valid, date_col]).as_unit("ns").asi8
+
+        # first contribution of every user, then users ranked by it (ties by code)
+        first = np.full(len(users), np.iinfo(np.int64).max)
+        np.minimum.at(first, codes, stamps)
+        by_first = np.lexsort((np.arange(len(users)), first))
+        rank = np.empty_like(by_first)
+        rank[by_first] = np.arange(len(users))
+
+        order = np.lexsort((stamps, rank[codes]))
+        self.users = users[by_first]
+        self.times = stamps[order]
+        self.offsets = np.r_[0, np.cumsum(np.bincount(rank[codes], minlength=len(users)))]
+        self.counts = np.diff(self.offsets)
+        self.first = self.times[self.offsets[:-1]]
+        repeat = self.counts >= 2
+        self.second = np.full(len(users), NAT_NS)
+        self.second[repeat] = self.times[self.offsets[:-1][repeat] + 1]
+        self.last = self.times[self.offsets[1:] - 1]
+
+    def cohorts(self, starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """User slices [lo, hi) of the cohorts first contributing in [starts, ends) (int64 ns)."""
+        return np.searchsorted(self.first, starts, side="left"), np.searchsorted(self.first, ends, side="left")
+
+    def cohort_buckets(self, edges: np.ndarray) -> np.ndarray:
+        """Bucket [edges[i], edges[i + 1]) of every user's first contribution, -1 outside the edges."""
+        buckets = np.searchsorted(edges, self.first, side="right") - 1
+        buckets[buckets >= len(edges) - 1] = -1
+        return buckets
+
+    def cohort_histogram(self, edges: np.ndarray, weights=None) -> np.ndarray:
+        """Users (or the sum of their `weights`) first contributing in every bucket of `edges`.
+
+        One binary search per user and one `bincount`, whatever the number of
+        buckets; `weights` are aligned with `users`.
+        """
+        buckets = self.cohort_buckets(edges)
+        inside = buckets >= 0
+        weights = None if weights is None else np.asarray(weights)[inside]
+        return np.bincount(buckets[inside], weights, minlength=max(len(edges) - 1, 0))
+
+    def retained(self, starts: np.ndarray, ends: np.ndarray, lookaheads) -> tuple[np.ndarray, np.ndarray]:
+        """(cohort sizes, retained users) of every cohort, for each of `lookaheads`.
+
+        A cohort member is retained after a lookahead when it contributed at or
+        after the start of its cohort's bucket plus the lookahead, i.e. when its
+        last contribution is that late; the result has one row per lookahead.
+        """
+        lo, hi = self.cohorts(starts, ends)
+        thresholds = starts[None, :] + np.asarray([pd.Timedelta(la).value for la in lookaheads])[:, None]
+        kept = np.array([[np.count_nonzero(self.last[a:b] >= t) for a, b, t in zip(lo, hi, row)]
+                         for row in thresholds], dtype=np.int64).reshape(len(thresholds), len(starts))
+        return hi - lo, kept
+
+def _bucket_ns(pts) -> tuple[np.ndarray, np.ndarray]:
+    starts, ends = zip(*pts) if pts else ((), ())
+    return (np.array(starts, dtype="datetime64[ns]").astype(np.int64),
+            np.array(ends, dtype="datetime64[ns]").astype(np.int64))
+
+def _edges_ns(pts) -> np.ndarray:
+    """The edges (int64 ns) of the contiguous buckets `pts`."""
+    starts, ends = _bucket_ns(pts)
+    if not np.array_equal(starts[1:], ends[:-1]):
+        raise ValueError("cohort histograms need contiguous buckets")
+    return np.r_[starts, ends[-1:]]
+
+def metric_retention(contrib_df, pts, lookaheads=RETENTION_LOOKAHEADS, index=None) -> dict:
+    """{name: retention series} of the cohorts of `pts` for every lookahead of `lookaheads`.
+
+    Pass an `index` built once to share it between calls (other granularities,
+    other grids).
+    """
+    index = index if index is not None else ContributionIndex(contrib_df)
+    starts, ends = _bucket_ns(pts)
+    sizes, kept = index.retained(starts, ends, lookaheads.values())
+
+    out = {}
+    for name, retained in zip(lookaheads, kept):
+        out[name] = [
+            { "x": start_date.strftime('%Y-%m-%d'),
+              "y": None if size == 0 else round(int(r) / int(size) * 100, 2) }
+            for (start_date, _), size, r in zip(pts, sizes, retained)
+        ]
     return out
 
-def metric_retention_90d(contrib_df, pts, lookahead=timedelta(days=90)):
-    contrib_df['created_at'] = pd.to_datetime(contrib_df['created_at'], utc=True)
-    first_contribs = first_contribution(contrib_df)
-    out = []
-
-    for start_date, end_date in pts:
-        start_ts = pd.Timestamp(start_date, tz='UTC')
-        end_ts = pd.Timestamp(end_date, tz='UTC')
-        cohort_users = first_contribs[(first_contribs >= start_ts) & (first_contribs < end_ts)].index
-
-        if len(cohort_users) == 0:
-            out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": None })
-            continue
+def metric_retention_90d(contrib_df, pts, lookahead=timedelta(days=90), index=None):
+    return metric_retention(contrib_df, pts, {"retention": lookahead}, index)["retention"]
 
-        retention_start = start_ts + lookahead
-        retained_users = contrib_df[
-            (contrib_df['user'].isin(cohort_users)) &
-            (contrib_df['created_at'] >= retention_start)
-        ]['user'].nunique()
+def metric_onboarding_success(pr_df, pts, index=None):
+    """Share of every cohort of first contributors that ever had a pull request merged.
 
-        retention_rate = retained_users / len(cohort_users) * 100
-        out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": round(retention_rate, 2) })
-
-    return out
+    A user's merge is looked up over all its rows, as `groupby().first()`
+    (first non‑null `merged_at`) counted it; cohort sizes and successes are
+    two histograms of the index.
+    """
+    require_datetime(pr_df, 'created_at', 'merged_at')
+    index = index if index is not None else ContributionIndex(pr_df)
+    merged = pd.Index(index.users).isin(pd.unique(pr_df.loc[pr_df['merged_at'].notna(), 'user']))
+    edges = _edges_ns(pts)
+    sizes, successes = index.cohort_histogram(edges), index.cohort_histogram(edges, merged)
 
-def metric_onboarding_success(pr_df, pts):
-    pr_df['created_at'] = pd.to_datetime(pr_df['created_at'], utc=True)
-    pr_df['merged_at'] = pd.to_datetime(pr_df['merged_at'], utc=True)
-    first_prs = pr_df.sort_values(by='created_at').groupby('user').first()
     out = []
-
-    for start_date, end_date in pts:
-        start_ts = pd.Timestamp(start_date, tz='UTC')
-        end_ts = pd.Timestamp(end_date, tz='UTC')
-        cohort = first_prs[ (first_prs['created_at'] >= start_ts) & (first_prs['created_at'] < end_ts) ]
-
-        if cohort.empty:
+    for (start_date, _), size, success in zip(pts, sizes, successes):
+        if size == 0:
             out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": None })
             continue
 
-        accepted = cohort['merged_at'].notna().sum()
-        success_rate = accepted / len(cohort) * 100
+        success_rate = success / int(size) * 100
         out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": str(round(success_rate, 2)) })
 
     return out
 
 
-def metric_median_time_to_second_contribution(df, pts):
-    df['created_at'] = pd.to_datetime(df['created_at'], utc=True)
-    out = []
-    df_sorted = df.sort_values(by='created_at')
-    user_contribs = df_sorted.groupby('user')['created_at'].apply(list)
+def metric_median_time_to_second_contribution(df, pts, index=None):
+    """Median whole days from first to second contribution of every cohort's repeat contributors."""
+    require_datetime(df, 'created_at')
+    index = index if index is not None else ContributionIndex(df)
+    days = (index.second - index.first) // DAY_NS
 
-    for start_date, end_date in pts:
-        start_ts = pd.Timestamp(start_date, tz='UTC')
-        end_ts = pd.Timestamp(end_date, tz='UTC')
-        cohort = user_contribs[ user_contribs.apply(lambda lst: len(lst) >= 2 and start_ts <= lst[0] < end_ts)]
+    lo, hi = index.cohorts(*_bucket_ns(pts))
+    out = []
+    for (start_date, _), a, b in zip(pts, lo, hi):
+        deltas = days[a:b][index.counts[a:b] >= 2]
 
-        if cohort.empty:
+        if deltas.size == 0:
             out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": None })
             continue
 
-        deltas = [ (contribs[1] - contribs[0]).days for contribs in cohort.values]
-        median_delta = str(int(round(np.median(deltas), 2))) if deltas else None
-        out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": median_delta })
+        out.append({ "x": start_date.strftime('%Y-%m-%d'), "y": str(int(round(np.median(deltas), 2))) })
 
     return out
@@ -0,0 +1,352 @@
+"""productivity.py – registry of the PR and issue productivity metrics.
+
+Every metric declares the item columns it reads and the shared passes it
+needs; `compute_productivity` plans which metrics apply to an entity (a
+metric whose columns the entity lacks, e.g. `merged_at` for issues, is
+skipped), runs each pass they need once and fills them.  The passes are
+
+    events         – one sort per timestamp column; every count over any
+                     bucket (last / previous period, open_by and close_by
+                     bins, merge rates, backlog) is a binary search into it
+    first_answers  – one sort + join of the comments onto the items
+    close_times    – time to close of the closed items, sorted by closing time
+    sketches       – a quantile digest (utils.sketches) of both durations per
+                     day, merged into the p50 / p90 / p99 of every bucket
+
+so a metric built on them adds no scan of the data.  Passes run in
+registration order, so a pass may read the ones before it.  `ENTITIES`
+describes the datasets and the JSON layout of pulls and issues.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from utils.dataProcessing import (bucket_counts, find_first_answers, open_at, rolling_windows,
+                                  safe_divide, sorted_events, sorted_stamps, window_bounds)
+from utils.sketches import QUANTILES, bucket_quantiles, day_digests, dump_sketches
+from utils.schema import apply_schema, require_datetime
+from utils.storage import find_dataset, read_frame
+from utils.timeGrid import grid, period_ends
+
+METRICS_DIR = Path(__file__).resolve().parents[3] / "metrics"
+
+PERIODS = ("day", "week", "month")
+DAY_FMT, MONTH_FMT = "%Y-%m-%d", "%Y-%m"
+LABELS = {"day": DAY_FMT, "week": DAY_FMT, "month": MONTH_FMT}
+
+# event name → timestamp column it is counted on
+EVENTS = {"opened": "created_at", "closed": "closed_at", "merged": "merged_at"}
+
+@dataclass(frozen=True)
+class Entity:
+    kind: str
+    comments_kind: str
+    item_columns: tuple
+    comment_columns: tuple
+    author: str
+    comment_col: str
+    prefix: str
+    label: str
+    output: str
+    sketches: str          # sidecar with the day digests of the durations
+    layout: tuple          # JSON keys, in the order the dashboards' files have always had them
+
+ENTITIES = {
+    "pulls": Entity(
+        kind="pulls", comments_kind="pulls_comments",
+        item_columns=("number", "user", "created_at", "closed_at", "merged_at"),
+        comment_columns=("pr_number", "user", "created_at"),
+        author="user", comment_col="pr_number", prefix="pr", label="PRs",
+        output="pullRequestAnalysis.json", sketches="pullRequestSketches.json",
+        layout=("opened", "closed", "merged", "merge_rate", "backlog", "open_by", "close_by",
+                "time_to_answer", "time_to_close", "opened_last", "opened_prev", "closed_last",
+                "closed_prev", "merged_last", "merged_prev", "merge_rate_last", "merge_rate_prev",
+                "trend_opened", "trend_closed", "trend_merged",
+                "time_to_answer_p50", "time_to_answer_p90", "time_to_answer_p99",
+                "time_to_close_p50", "time_to_close_p90", "time_to_close_p99"),
+    ),
+    "issues": Entity(
+        kind="issues", comments_kind="issues_comments",
+        item_columns=("number", "author", "created_at", "closed_at"),
+        comment_columns=("issue_number", "user", "created_at"),
+        author="author", comment_col="issue_number", prefix="issue", label="issues",
+        output="issuesAnalysis.json", sketches="issuesSketches.json",
+        layout=("trend_opened", "trend_closed", "backlog", "open_by", "close_by", "time_to_answer",
+                "time_to_close", "opened_last", "closed_last", "opened_prev", "closed_prev",
+                "time_to_answer_p50", "time_to_answer_p90", "time_to_answer_p99",
+                "time_to_close_p50", "time_to_close_p90", "time_to_close_p99"),
+    ),
+}
+
+@dataclass(frozen=True)
+class Metric:
+    key: str
+    fn: Callable
+    columns: tuple
+    passes: tuple
+
+METRICS: dict[str, Metric] = {}
+PASSES: dict[str, Callable] = {}
+
+def register_metric(key: str, fn: Callable, columns=(), passes=()) -> None:
+    METRICS[key] = Metric(key, fn, tuple(columns), tuple(passes))
+
+def metric(key: str, columns=(), passes=()):
+    """Register `fn(run) -> {period: value}` as the metric `key`."""
+    def register(fn):
+        register_metric(key, fn, columns, passes)
+        return fn
+    return register
+
+def shared_pass(name: str):
+    """Register `fn(run)` as a pass whose result metrics read from `run.passes[name]`."""
+    def register(fn):
+        PASSES[name] = fn
+        return fn
+    return register
+
+@dataclass
+class Run:
+    entity: Entity
+    items: pd.DataFrame
+    comments: pd.DataFrame
+    passes: dict
+
+###############################################################################
+# Shared passes
+###############################################################################
+
+@shared_pass("events")
+def _events(run: Run) -> dict:
+    """Sorted int64 ns of every event column, plus what the backlog and merge rates need."""
+    items = run.items
+    events = {col: sorted_stamps(items[col]) for col in EVENTS.values() if col in items.columns}
+
+    created, closed = items["created_at"], items["closed_at"]
+    both = created.notna() & closed.notna()
+    events["resolved"] = sorted_stamps(created[both].where(created[both] > closed[both], closed[both]))
+
+    if "merged_at" in items.columns:
+        stamps = pd.DatetimeIndex(closed).as_unit("ns")
+        keep = ~stamps.isna()
+        order = np.argsort(stamps.asi8[keep], kind="stable")
+        merged = items["merged_at"].notna().to_numpy()[keep][order]
+        events["merged_prefix"] = np.concatenate(([0], np.cumsum(merged)))
+    return events
+
+@shared_pass("first_answers")
+def _first_answers(run: Run) -> tuple:
+    e = run.entity
+    rows = find_first_answers(run.items, run.comments, e.comment_col, e.author, e.prefix)
+    if not rows:
+        print("[Warning] No data available for first answer calculation.")
+    return sorted_events(rows, "first_answer_at", "time_to_first_answer_hours")
+
+@shared_pass("close_times")
+def _close_times(run: Run) -> tuple:
+    closed = run.items[run.items["closed_at"].notna()]
+    if closed.empty:
+        print("[Warning] No data available for time to close calculation.")
+    stamps = pd.DatetimeIndex(closed["closed_at"]).as_unit("ns").asi8
+    hours = ((closed["closed_at"] - closed["created_at"]).dt.total_seconds() / 3600).to_numpy(dtype=float)
+    order = np.argsort(stamps, kind="stable")
+    return stamps[order], hours[order]
+
+# duration → pass holding its sorted (times, hours)
+DURATIONS = {"time_to_answer": "first_answers", "time_to_close": "close_times"}
+
+@shared_pass("sketches")
+def _sketches(run: Run) -> dict:
+    """Day digests of every duration computed in this run, and the quantiles of every bucket.
+
+    Day digests cover all days of the longest grid; week and month buckets
+    merge them.  Values are hours for days and days otherwise, as in the
+    mean series.
+    """
+    edges = {p: grid(p) for p in PERIODS}
+    span = int((edges["day"][-1] - min(e[0] for e in edges.values())) // np.timedelta64(1, "D"))
+    days = grid("day", span)
+
+    out = {"days": {}, "quantiles": {}}
+    for duration, source in DURATIONS.items():
+        if source not in run.passes:
+            continue
+        times, hours = run.passes[source]
+        out["days"][duration] = digests = day_digests(times, hours, days)
+        out["quantiles"][duration] = {
+            p: {name: [v if p == "day" else v / 24 for v in values]
+                for name, values in bucket_quantiles(digests, edges[p]).items()}
+            for p in PERIODS
+        }
+    return out
+
+###############################################################################
+# Metrics
+###############################################################################
+
+def _last_prev(run: Run, col: str, period: str) -> tuple[int, int]:
+    prev, last = bucket_counts(run.passes["events"][col], grid(period, 2))
+    return int(last), int(prev)
+
+def _count_metric(col: str, which: int):
+    return lambda run: {p: _last_prev(run, col, p)[which] for p in PERIODS}
+
+def _trend_metric(col: str):
+    def fn(run):
+        return {p: safe_divide(*_last_prev(run, col, p), 2) - 1 for p in PERIODS}
+    return fn
+
+def _merge_rate_metric(which: int):
+    def fn(run):
+        out = {}
+        for p in PERIODS:
+            merged = _last_prev(run, "merged_at", p)[which]
+            closed = _last_prev(run, "closed_at", p)[which]
+            out[p] = round(safe_divide(merged, closed, 4) * 100, 2) - 1
+        return out
+    return fn
+
+for _event, _col in EVENTS.items():
+    register_metric(f"{_event}_last", _count_metric(_col, 0), (_col,), ("events",))
+    register_metric(f"{_event}_prev", _count_metric(_col, 1), (_col,), ("events",))
+    register_metric(f"trend_{_event}", _trend_metric(_col), (_col,), ("events",))
+register_metric("merge_rate_last", _merge_rate_metric(0), ("closed_at", "merged_at"), ("events",))
+register_metric("merge_rate_prev", _merge_rate_metric(1), ("closed_at", "merged_at"), ("events",))
+
+@metric("backlog", columns=("created_at", "closed_at"), passes=("events",))
+def _backlog(run: Run) -> dict:
+    events = run.passes["events"]
+    out = {}
+    for p in PERIODS:
+        points = period_ends(p)
+        sizes = open_at(events["created_at"], events["resolved"], points)
+        out[p] = [{"y": int(y), "x": ts.strftime(LABELS[p])} for y, ts in zip(sizes, points)]
+    return out
+
+def _bins(p: str) -> pd.DatetimeIndex:
+    # open_by / close_by cover the 29 full days before today
+    return pd.DatetimeIndex(grid(p, 29 if p == "day" else 30)).tz_localize("UTC")
+
+def _binned_metric(col: str):
+    def fn(run):
+        out = {}
+        for p in PERIODS:
+            edges = _bins(p)
+            counts = bucket_counts(run.passes["events"][col], edges)
+            out[p] = [{"y": int(y), "x": start.strftime(LABELS[p])} for y, start in zip(counts, edges[:-1])]
+        return out
+    return fn
+
+register_metric("open_by", _binned_metric("created_at"), ("created_at",), ("events",))
+register_metric("close_by", _binned_metric("closed_at"), ("closed_at",), ("events",))
+
+@metric("merge_rate", columns=("closed_at", "merged_at"), passes=("events",))
+def _merge_rate(run: Run) -> dict:
+    """% of the items closed in every bucket that were merged, 2 decimals (0.0 for empty buckets)."""
+    events = run.passes["events"]
+    out = {}
+    for p in PERIODS:
+        edges = pd.DatetimeIndex(grid(p)).tz_localize("UTC")
+        closed = bucket_counts(events["closed_at"], edges).tolist()
+        merged = bucket_counts(events["closed_at"], edges, events["merged_prefix"]).tolist()
+        out[p] = [{"y": round(m / c * 100, 2) if c else 0.0, "x": start.strftime(LABELS[p])}
+                  for c, m, start in zip(closed, merged, edges[:-1])]
+    return out
+
+def _rolling_series(times: np.ndarray, hours: np.ndarray, labels: dict) -> dict:
+    """Mean duration over the rolling window ending at every point: hours per day, days otherwise."""
+    out = {}
+    for p in PERIODS:
+        points = period_ends(p)
+        values = hours if p == "day" else hours / 24
+        starts, ends = window_bounds(times, points, p)
+        means = [0 if math.isnan(x) else round(x, 2) for x in rolling_windows(times, values, starts, ends)["mean"].tolist()]
+        if p == "day":
+            means = means[::-1]      # day values have always been listed newest first
+        out[p] = [{"y": v, "x": ts.strftime(labels[p])} for v, ts in zip(means, points)]
+    return out
+
+@metric("time_to_answer", columns=("number", "created_at"), passes=("first_answers",))
+def _time_to_answer(run: Run) -> dict:
+    return _rolling_series(*run.passes["first_answers"], {p: DAY_FMT for p in PERIODS})
+
+@metric("time_to_close", columns=("created_at", "closed_at"), passes=("close_times",))
+def _time_to_close(run: Run) -> dict:
+    return _rolling_series(*run.passes["close_times"], LABELS)
+
+def _quantile_metric(duration: str, name: str, labels: dict):
+    def fn(run):
+        out = {}
+        for p in PERIODS:
+            values = run.passes["sketches"]["quantiles"][duration][p][name]
+            out[p] = [{"y": 0 if math.isnan(v) else round(v, 2), "x": ts.strftime(labels[p])}
+                      for v, ts in zip(values, period_ends(p))]
+        return out
+    return fn
+
+for _name in QUANTILES:
+    register_metric(f"time_to_answer_{_name}", _quantile_metric("time_to_answer", _name, {p: DAY_FMT for p in PERIODS}),
+                    ("number", "created_at"), ("first_answers", "sketches"))
+    register_metric(f"time_to_close_{_name}", _quantile_metric("time_to_close", _name, LABELS),
+                    ("created_at", "closed_at"), ("close_times", "sketches"))
+
+###############################################################################
+# Engine
+###############################################################################
+
+def plan(entity: Entity) -> tuple[list[Metric], list[str]]:
+    """Metrics of `entity`'s layout it has the columns for, and the passes they need (in registry order)."""
+    columns = set(entity.item_columns)
+    metrics = [METRICS[key] for key in entity.layout if key in METRICS and set(METRICS[key].columns) <= columns]
+    passes = [name for name in PASSES if any(name in m.passes for m in metrics)]
+    return metrics, passes
+
+def compute_productivity(entity: Entity, items: pd.DataFrame, comments: pd.DataFrame) -> tuple[dict, dict]:
+    """Every registered metric of `entity`, laid out as its JSON file, and the day digests of its durations."""
+    require_datetime(items, *[col for col in EVENTS.values() if col in items.columns])
+    require_datetime(comments, "created_at")
+
+    metrics, passes = plan(entity)
+    run = Run(entity, items, comments, {})
+    for name in passes:
+        run.passes[name] = PASSES[name](run)
+
+    results = {key: {} for key in entity.layout}
+    for m in metrics:
+        results[m.key] = m.fn(run)
+    return results, run.passes.get("sketches", {}).get("days", {})
+
+def load_entity(files_dir: Path, org_name: str, repo_name: str, entity: Entity) -> tuple | None:
+    """(items, comments) of `entity`, or None when either dataset is missing."""
+    item_file = find_dataset(files_dir, org_name, repo_name, entity.kind)
+    comment_file = find_dataset(files_dir, org_name, repo_name, entity.comments_kind)
+    if item_file is None or comment_file is None:
+        return None
+
+    items = apply_schema(read_frame(item_file, list(entity.item_columns)), entity.kind)
+    comments = apply_schema(read_frame(comment_file, list(entity.comment_columns)), entity.comments_kind)
+    print(f"Loaded {item_file.name} and {comment_file.name}.")
+    print(f"Total {entity.label}: {len(items)}, Total comments: {len(comments)}")
+    return items, comments
+
+def save_productivity(org_name: str, repo_name: str, entity: Entity, results: dict, sketches: dict) -> Path:
+    """Write `entity`'s JSON file and its sketch sidecar under metrics/<org>/<repo>/."""
+    nested_dir = METRICS_DIR / org_name / repo_name
+    nested_dir.mkdir(parents=True, exist_ok=True)
+    output_path = nested_dir / entity.output
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, default=str)
+    dump_sketches(nested_dir / entity.sketches, sketches)
+
+    print(f"Results saved to {output_path}")
+    return output_path
@@ -0,0 +1,152 @@
+"""rateLimit.py – token‑wide request pacing for the GitHub extractors.
+
+One `RateLimitScheduler` exists per API token and process; every request made
+through `utils.githubHttp` (PyGithub) or `utils.githubGraphQL` asks it for a
+slot first and reports the `x-ratelimit-*` headers of the response back.
+
+• While more than `pace_below` of the hourly budget is left, requests run
+  unthrottled.
+• Below that, slots are spread evenly over the time left until the window
+  resets, so the budget lasts until the reset instead of running dry early.
+• When only `reserve` requests are left, callers sleep exactly until the
+  reset time reported by GitHub instead of failing with a 403.
+
+Slots are handed out first‑come first‑served under one lock, so several
+extractors (threads) or repositories sharing a token get an even share of
+the budget.  Processes sharing a token can each claim a fraction of it with
+`share`: the `x-ratelimit-remaining` header counts the whole token, so a
+process paces on its own allotment (`share` × limit minus the requests it
+sent in the current window), capped by what the token has left.
+
+Conditional requests (If‑None‑Match / If‑Modified‑Since, see `httpCache`)
+are not billed when GitHub answers 304, so they are not paced and only
+count against the budget once a response shows they were billed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Callable, Mapping
+
+@dataclass
+class _Bucket:
+    limit: int | None = None
+    remaining: int | None = None
+    reset: float = 0.0
+    next_slot: float = 0.0
+    sent: int = 0          # requests this scheduler sent in the current window
+    hold: float = 0.0      # no request before this (secondary rate limit)
+
+class RateLimitScheduler:
+    def __init__(
+        self,
+        *,
+        reserve: int = 20,
+        pace_below: float = 0.5,
+        share: float = 1.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self.share = share
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+        self.waited = 0.0
+
+    def _bucket(self, resource: str) -> _Bucket:
+        return self._buckets.setdefault(resource, _Bucket())
+
+    def _delay(self, b: _Bucket, now: float, paced: bool = True) -> float:
+        """Seconds the next request on `b` has to wait (called under the lock);
+        unless `paced` it only waits at the reserve or a secondary limit."""
+        start = b.next_slot if paced else b.hold
+        if b.remaining is None or b.limit is None:
+            return max(start - now, 0.0)
+
+        if now >= b.reset:
+            # window rolled over; trust the limit until a response says otherwise
+            b.remaining = b.limit
+            b.sent = 0
+            return max(start - now, 0.0)
+
+        # this process's allotment, never more than the token has left
+        allotment = self.share * b.limit
+        budget = min(b.remaining, allotment - b.sent)
+        if budget <= self.reserve:
+            return max(b.reset + 1.0 - now, start - now, 0.0)
+
+        if not paced or budget > self.pace_below * allotment:
+            return max(start - now, 0.0)
+
+        interval = (b.reset - now) / max(budget - self.reserve, 1)
+        slot = max(b.next_slot, now)
+        b.next_slot = slot + interval
+        return slot - now
+
+    def acquire(self, resource: str = "core", conditional: bool = False) -> None:
+        """Block until a request on `resource` may be sent."""
+        with self._lock:
+            now = self._clock()
+            b = self._bucket(resource)
+            delay = self._delay(b, now, paced=not conditional)
+            if not conditional:
+                if b.remaining is not None:
+                    b.remaining -= 1
+                b.sent += 1
+        if delay > 0:
+            self.waited += delay
+            self._sleep(delay)
+
+    def update(self, headers: Mapping[str, str], status: int = 200, resource: str = "core",
+               conditional: bool = False) -> None:
+        """Record the rate‑limit headers of a response."""
+        headers = {k.lower(): v for k, v in headers.items()}
+        resource = headers.get("x-ratelimit-resource", resource)
+        with self._lock:
+            b = self._bucket(resource)
+            if conditional and status != 304:
+                # billed after all: count it as `acquire` would have
+                if b.remaining is not None:
+                    b.remaining -= 1
+                b.sent += 1
+            if "x-ratelimit-limit" in headers:
+                b.limit = int(float(headers["x-ratelimit-limit"]))
+            if "x-ratelimit-remaining" in headers:
+                b.remaining = int(float(headers["x-ratelimit-remaining"]))
+            if "x-ratelimit-reset" in headers:
+                b.reset = float(headers["x-ratelimit-reset"])
+            if status in (403, 429) and "retry-after" in headers:
+                # secondary rate limit: hold every caller back for the advertised time
+                b.hold = max(b.hold, self._clock() + float(headers["retry-after"]))
+                b.next_slot = max(b.next_slot, b.hold)
+
+_SCHEDULERS: dict[str, RateLimitScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+_DEFAULTS: dict = {}
+
+def configure_schedulers(**kwargs) -> None:
+    """Set defaults (reserve, pace_below, share …) for schedulers created from now on."""
+    _DEFAULTS.update(kwargs)
+
+def scheduler_for(token: str | None) -> RateLimitScheduler:
+    """The process‑wide scheduler of `token` (anonymous requests share one)."""
+    key = hashlib.sha256((token or "").encode()).hexdigest()
+    with _SCHEDULERS_LOCK:
+        if key not in _SCHEDULERS:
+            _SCHEDULERS[key] = RateLimitScheduler(**_DEFAULTS)
+        return _SCHEDULERS[key]
+
+def resource_for_path(path: str) -> str:
+    """Best guess of the rate‑limit resource a request path is billed to."""
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
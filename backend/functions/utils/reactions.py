@@ -0,0 +1,54 @@
+"""reactions.py – per‑type reaction counts of issues and comments.
+
+REST issues, issue comments and review comments embed a ``reactions``
+rollup (``{"total_count": 3, "+1": 2, "heart": 1, …}``) and GraphQL returns
+``reactionGroups``; both carry the counts the datasets store, so the
+extractors read them instead of listing every reaction (one paginated call
+per object).  Listing stays available as an opt‑in (``--full_reactions``)
+for runs that need the reactions in the order they were given.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+# GraphQL ReactionContent enum → REST reaction `content`, in GitHub's order
+REACTION_CONTENT = {
+    "THUMBS_UP": "+1",
+    "THUMBS_DOWN": "-1",
+    "LAUGH": "laugh",
+    "HOORAY": "hooray",
+    "CONFUSED": "confused",
+    "HEART": "heart",
+    "ROCKET": "rocket",
+    "EYES": "eyes",
+}
+
+def counts_from_rollup(rollup: dict | None) -> dict:
+    """Non‑zero counts of a REST ``reactions`` rollup."""
+    rollup = rollup or {}
+    return {content: rollup[content] for content in REACTION_CONTENT.values() if rollup.get(content)}
+
+def counts_from_groups(groups: list | None) -> dict:
+    """Non‑zero counts of GraphQL ``reactionGroups``."""
+    counts = {}
+    for group in groups or []:
+        total = group["reactors"]["totalCount"]
+        if total:
+            counts[REACTION_CONTENT.get(group["content"], group["content"].lower())] = total
+    return counts
+
+def counts_from_listing(reactions: Iterable) -> dict:
+    """Counts of fully listed reactions, in order of first appearance."""
+    return dict(Counter(r.content for r in reactions))
+
+def expand(counts: dict) -> list:
+    """One entry per reaction, grouped by type (the listing order is unknown)."""
+    return [content for content, n in counts.items() for _ in range(n)]
+
+def reaction_counts(obj, full: bool = False) -> dict:
+    """Counts of a PyGithub issue or comment; `full` lists every reaction."""
+    if full:
+        return counts_from_listing(obj.get_reactions())
+    return counts_from_rollup(obj.reactions)
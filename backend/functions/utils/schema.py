@@ -0,0 +1,105 @@
+"""schema.py – column types of every dataset kind.
+
+The xlsx files hold every cell as a string, and parquet files of older runs
+may hold untyped columns, so the metrics used to parse the same timestamps
+again in every function.  `load_typed` (or `apply_schema` on a frame read
+with `storage.read_frame`) types a dataset once, when it is loaded:
+timestamps become datetime64[ns, UTC], ids and counts nullable Int64, flags
+nullable boolean and closed vocabularies categorical.  Columns a schema does
+not list (logins, titles, bodies, label lists …) are left as read.  Metrics
+only check the types, with `require_datetime`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from utils.storage import find_dataset, read_frame
+
+DATETIME = "datetime64[ns, UTC]"
+INT = "Int64"
+BOOL = "boolean"
+CATEGORY = "category"
+
+SCHEMAS = {
+    "pulls": {
+        "number": INT, "id": INT,
+        "created_at": DATETIME, "updated_at": DATETIME, "closed_at": DATETIME, "merged_at": DATETIME,
+        "state": CATEGORY, "draft": BOOL, "mergeable": BOOL, "mergeable_state": CATEGORY,
+        "merged": BOOL, "rebaseable": BOOL,
+        "commits": INT, "additions": INT, "deletions": INT, "changed_files": INT,
+        "milestone": INT,
+    },
+    "pulls_comments": {
+        "pr_number": INT, "id": INT, "created_at": DATETIME, "position": INT, "in_reply_to_id": INT,
+    },
+    "issues": {
+        "number": INT, "id": INT,
+        "created_at": DATETIME, "updated_at": DATETIME, "closed_at": DATETIME,
+        "state": CATEGORY, "locked": BOOL, "comments": INT,
+    },
+    "issues_comments": {
+        "issue_number": INT, "comment_id": INT, "created_at": DATETIME,
+    },
+    "milestones": {
+        "id": INT, "created_at": DATETIME, "closed_at": DATETIME,
+    },
+    "commits": {
+        "created_at": DATETIME,
+    },
+}
+
+_BOOLS = {"true": True, "false": False}
+
+def _to_datetime(s: pd.Series) -> pd.Series:
+    return pd.to_datetime(s, utc=True, errors="coerce").dt.as_unit("ns")
+
+def _to_int(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors="coerce").astype(INT)
+
+def _to_bool(s: pd.Series) -> pd.Series:
+    if s.dtype == object or pd.api.types.is_string_dtype(s):
+        s = s.map(lambda v: _BOOLS.get(v.lower()) if isinstance(v, str) else v)
+    return s.astype(BOOL)
+
+_PARSERS = {
+    DATETIME: _to_datetime,
+    INT: _to_int,
+    BOOL: _to_bool,
+    CATEGORY: lambda s: s.astype(CATEGORY),
+}
+
+def apply_schema(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """`df` with the columns of `kind`'s schema it holds cast to their types."""
+    schema = SCHEMAS.get(kind, {})
+    todo = {col: dtype for col, dtype in schema.items() if col in df.columns and str(df[col].dtype) != dtype}
+    if not todo:
+        return df
+    df = df.copy(deep=False)
+    for col, dtype in todo.items():
+        df[col] = _PARSERS[dtype](df[col])
+    return df
+
+def empty_frame(kind: str, columns: Iterable[str]) -> pd.DataFrame:
+    """Typed frame with no rows, standing in for a dataset that was never extracted."""
+    schema = SCHEMAS.get(kind, {})
+    return pd.DataFrame({col: pd.Series(dtype=schema.get(col, object)) for col in columns})
+
+def load_typed(files_dir: Path, org_name: str, repo_name: str, kind: str,
+               columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """Dataset `kind` (projected on `columns`) with its schema applied, or an empty typed frame."""
+    path = find_dataset(files_dir, org_name, repo_name, kind)
+    if path is None:
+        return empty_frame(kind, columns if columns is not None else SCHEMAS.get(kind, {}))
+    return apply_schema(read_frame(path, columns), kind)
+
+def require_datetime(df: pd.DataFrame, *columns: str) -> None:
+    """Raise TypeError unless every one of `columns` is a UTC datetime column."""
+    for col in columns:
+        dtype = df[col].dtype
+        if not (isinstance(dtype, pd.DatetimeTZDtype) and str(dtype.tz) == "UTC"):
+            raise TypeError(f"column {col!r} must be datetime64[ns, UTC], got {dtype} "
+                            f"(load datasets with utils.schema)")
@@ -0,0 +1,116 @@
+"""shards.py – splitting a full extraction into index ranges and merging them.
+
+A shard is the range [min, max) of listing indices handed to one extractor
+process; it writes ``<org>_<repo>_<min>_<max>_<kind>`` files.  The merge
+concatenates the shards of a kind into the canonical ``<org>_<repo>_<kind>``
+dataset the processors read.  Items are deduplicated by `id` (listings shift
+while shards run, so an item can land in two of them) keeping the copy with
+the newest `updated_at`, and the comments of each item are taken from the
+shard whose copy won.
+
+A run records its plan (start time, format and ranges) in
+``<org>_<repo>_shards.json`` before any shard starts and removes it once
+merged.  Shard files are only reused while that plan is there, i.e. by a
+rerun of the same unfinished run; any other run deletes them first.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from utils.storage import DEFAULT_FORMAT, FORMATS, concat_frames, dataset_path, read_frame, write_dataset
+
+# upper bound of the last shard, same as the extractors' CLI default
+OPEN_END = 10000000
+
+# kind -> (comment kind, column of the parent number, comment id column)
+CHILDREN = {
+    "pulls":  ("pulls_comments", "pr_number", "id"),
+    "issues": ("issues_comments", "issue_number", "comment_id"),
+}
+
+def shard_ranges(total: int, shards: int, align: int = 1) -> list[tuple[int, int]]:
+    """Split [0, total) into at most `shards` ranges whose bounds are multiples
+    of `align` (the page size, so no page is listed by two shards).  The last
+    range is left open so items created during the run are not missed."""
+    size = max(math.ceil(total / max(shards, 1) / align), 1) * align
+    count = max(math.ceil(total / size), 1)
+    ranges = [(i * size, (i + 1) * size) for i in range(count)]
+    ranges[-1] = (ranges[-1][0], OPEN_END)
+    return ranges
+
+def shard_paths(out_dir: Path, org_name: str, repo_name: str, kind: str, shard: tuple,
+                fmt: str = DEFAULT_FORMAT) -> list[Path]:
+    return [dataset_path(out_dir, org_name, repo_name, k, fmt, shard) for k in (kind, CHILDREN[kind][0])]
+
+def plan_path(out_dir: Path, org_name: str, repo_name: str) -> Path:
+    return Path(out_dir) / f"{org_name.lower()}_{repo_name.lower()}_shards.json"
+
+def load_plan(path: Path) -> tuple[datetime, str, dict] | None:
+    """(start time, format, {kind: ranges}) of an unfinished run, or None."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open(encoding="utf-8") as fh:
+        plan = json.load(fh)
+    ranges = {kind: [tuple(r) for r in shards] for kind, shards in plan["ranges"].items()}
+    return datetime.fromisoformat(plan["started"]), plan["format"], ranges
+
+def save_plan(path: Path, started: datetime, fmt: str, ranges: dict) -> None:
+    plan = {"started": started.isoformat(), "format": fmt,
+            "ranges": {kind: [list(r) for r in shards] for kind, shards in ranges.items()}}
+    tmp = Path(path).with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(plan, fh, indent=2)
+    os.replace(tmp, path)
+
+def remove_shard_files(out_dir: Path, org_name: str, repo_name: str, kind: str) -> int:
+    """Delete every shard file of `kind` and its comments, whatever its range or format."""
+    stem = re.escape(f"{org_name.lower()}_{repo_name.lower()}")
+    kinds = "|".join(re.escape(k) for k in (kind, CHILDREN[kind][0]))
+    exts = "|".join(re.escape(e) for e in FORMATS.values())
+    pattern = re.compile(rf"{stem}_\d+_\d+_(?:{kinds})(?:{exts})")
+    stale = [p for p in Path(out_dir).iterdir() if pattern.fullmatch(p.name)]
+    for path in stale:
+        path.unlink()
+    return len(stale)
+
+def merge_shards(out_dir: Path, org_name: str, repo_name: str, kind: str, ranges: list[tuple],
+                 fmt: str = DEFAULT_FORMAT, export_xlsx: bool = False) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Merge the shard files of `kind` and its comments into the canonical datasets."""
+    child_kind, parent_col, child_key = CHILDREN[kind]
+    items, children = [], []
+    for i, shard in enumerate(ranges):
+        for parts, path in zip((items, children), shard_paths(out_dir, org_name, repo_name, kind, shard, fmt)):
+            part = read_frame(path)
+            # an empty part (e.g. a shard without comments) would upcast the ids to float
+            if len(part):
+                parts.append(part.assign(_shard=i))
+
+    items = concat_frames(items)
+    children = concat_frames(children)
+
+    if "id" in items.columns:
+        winners = (items.sort_values("updated_at", kind="stable")
+                        .drop_duplicates("id", keep="last")
+                        .sort_index())
+        won = pd.MultiIndex.from_frame(winners[["number", "_shard"]])
+        if parent_col in children.columns:
+            owned = pd.MultiIndex.from_arrays([children[parent_col], children["_shard"]]).isin(won)
+            children = children[owned].drop_duplicates(child_key, keep="last")
+        items = winners
+
+    items = items.drop(columns="_shard", errors="ignore").reset_index(drop=True)
+    children = children.drop(columns="_shard", errors="ignore").reset_index(drop=True)
+
+    write_dataset(items, out_dir, org_name, repo_name, kind, fmt, export_xlsx=export_xlsx)
+    write_dataset(children, out_dir, org_name, repo_name, child_kind, fmt, export_xlsx=export_xlsx)
+    return items, children
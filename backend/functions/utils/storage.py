@@ -0,0 +1,149 @@
+"""storage.py – dataset files under backend/files.
+
+Extractors write one file per dataset kind (``pulls``, ``pulls_comments``,
+``issues``, ``issues_comments``, ``milestones``) named
+``<org>_<repo>[_<min>_<max>]_<kind>.<ext>``.  Parquet is the default format:
+it keeps datetime / integer / boolean dtypes and lets readers load only the
+columns they need.  Feather is available as an alternative and xlsx is kept
+as an export (and as a read fallback for files produced by older runs).
+"""
+
+from __future__ import annotations
+
+import os
+
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_FORMAT = "parquet"
+FORMATS = {"parquet": ".parquet", "feather": ".feather", "xlsx": ".xlsx"}
+
+# read preference when several formats of the same dataset exist
+_READ_ORDER = ("parquet", "feather", "xlsx")
+
+def dataset_path(out_dir: Path, org_name: str, repo_name: str, kind: str,
+                 fmt: str = DEFAULT_FORMAT, shard: tuple | None = None) -> Path:
+    stem = f"{org_name.lower()}_{repo_name.lower()}"
+    if shard is not None:
+        stem += f"_{shard[0]}_{shard[1]}"
+    return Path(out_dir) / f"{stem}_{kind}{FORMATS[fmt]}"
+
+def find_dataset(files_dir: Path, org_name: str, repo_name: str, kind: str) -> Path | None:
+    """Return the canonical (unsharded) file for `kind`, preferring columnar formats."""
+    for fmt in _READ_ORDER:
+        path = dataset_path(files_dir, org_name, repo_name, kind, fmt)
+        if path.exists():
+            return path
+    return None
+
+def frame_from_rows(rows: list[dict]) -> pd.DataFrame:
+    """Build a typed frame from extractor rows.
+
+    Lists and dicts (labels, assignees, reaction counts …) are stored as their
+    string representation, exactly as the xlsx files always held them; every
+    other column keeps the dtype pandas infers.  Text cleaning is left to
+    `clean_text_columns`, as before.
+    """
+    df = pd.DataFrame(rows)
+    for col in df.columns:
+        if df[col].dtype == object and df[col].map(lambda v: isinstance(v, (list, dict))).any():
+            df[col] = df[col].map(lambda v: str(v) if isinstance(v, (list, dict)) else v)
+    return df
+
+def concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate parts of one dataset (checkpoint parts, shards).
+
+    A part in which a timestamp column is entirely null is read back untyped;
+    such columns are parsed again so the result keeps its datetime dtype.
+    """
+    frames = [f for f in frames if len(f.columns)]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    for col in df.columns:
+        if not pd.api.types.is_datetime64_any_dtype(df[col]) and \
+                any(col in f.columns and pd.api.types.is_datetime64_any_dtype(f[col]) for f in frames):
+            df[col] = pd.to_datetime(df[col], utc=True)
+    return df
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Stringify object columns Arrow cannot type (mixed python types)."""
+    out = df
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            if out is df:
+                out = df.copy()
+            out[col] = df[col].map(lambda v: v if v is None or (isinstance(v, float) and pd.isna(v)) else str(v))
+    return out
+
+def write_frame(df: pd.DataFrame, path: Path) -> Path:
+    """Write `df` in the format given by the suffix of `path` (atomically)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+
+    if path.suffix == ".parquet":
+        _arrow_safe(df).to_parquet(tmp, index=False)
+    elif path.suffix == ".feather":
+        _arrow_safe(df).reset_index(drop=True).to_feather(tmp)
+    elif path.suffix == ".xlsx":
+        df.astype(str).to_excel(tmp, engine="openpyxl")
+    else:
+        raise ValueError(f"Unsupported dataset format: {path.suffix}")
+
+    os.replace(tmp, path)
+    return path
+
+def write_dataset(df: pd.DataFrame, out_dir: Path, org_name: str, repo_name: str, kind: str,
+                  fmt: str = DEFAULT_FORMAT, shard: tuple | None = None, export_xlsx: bool = False) -> Path:
+    path = write_frame(df, dataset_path(out_dir, org_name, repo_name, kind, fmt, shard))
+    if export_xlsx and fmt != "xlsx":
+        write_frame(df, dataset_path(out_dir, org_name, repo_name, kind, "xlsx", shard))
+    return path
+
+def _available_columns(path: Path) -> list[str]:
+    if path.suffix == ".parquet":
+        return pq.read_schema(path).names
+    if path.suffix == ".feather":
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).schema.names
+    return []
+
+def read_frame(path: Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """Read one dataset file, loading only `columns` when given.
+
+    Requested columns missing from the file are skipped rather than raising,
+    so callers can project onto the union of what any producer writes.
+    """
+    path = Path(path)
+    wanted = list(columns) if columns is not None else None
+
+    if path.suffix in (".parquet", ".feather"):
+        if wanted is not None:
+            present = set(_available_columns(path))
+            wanted = [c for c in wanted if c in present]
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path, columns=wanted)
+        return pd.read_feather(path, columns=wanted)
+
+    if path.suffix == ".xlsx":
+        df = pd.read_excel(path, index_col=0)
+        return df[[c for c in wanted if c in df.columns]] if wanted is not None else df
+
+    raise ValueError(f"Unsupported dataset format: {path.suffix}")
+
+def load_dataset(files_dir: Path, org_name: str, repo_name: str, kind: str,
+                 columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """Canonical dataset for `kind`, or an empty frame when it was never extracted."""
+    path = find_dataset(files_dir, org_name, repo_name, kind)
+    if path is None:
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+    return read_frame(path, columns)
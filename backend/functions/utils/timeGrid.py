@@ -0,0 +1,77 @@
+"""timeGrid.py – the day / week / month buckets every metric of a run samples on.
+
+A grid is `n` consecutive calendar buckets (days, ISO weeks starting on
+Monday, months) ending `cutoff_days` before the bucket that contains
+`as_of`, which is therefore never included while incomplete.  Edges are
+returned as a read‑only ``datetime64[ns]`` array of `n + 1` UTC instants
+and memoised per (period, n, cutoff_days, as_of), so the processors of one
+run share both the reference moment and the edges.
+
+`as_of` defaults to the run‑wide moment fixed on first use (or with
+`set_run_as_of`), instead of every module calling ``datetime.now()`` at
+import time.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+PERIODS = ("day", "week", "month")
+
+_RUN_AS_OF: datetime | None = None
+
+def set_run_as_of(moment: datetime | None = None) -> datetime:
+    """Fix the reference moment of the run (now, UTC, by default)."""
+    global _RUN_AS_OF
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    _RUN_AS_OF = moment.astimezone(timezone.utc)
+    return _RUN_AS_OF
+
+def run_as_of() -> datetime:
+    return _RUN_AS_OF or set_run_as_of()
+
+@lru_cache(maxsize=None)
+def _edges(period: str, n: int, cutoff_days: int, today: np.datetime64) -> np.ndarray:
+    if period == "day":
+        first = today - (cutoff_days + n)
+        edges = first + np.arange(n + 1)
+    elif period == "week":
+        # 1970‑01‑01 was a Thursday
+        this_monday = today - (today.astype(np.int64) + 3) % 7
+        first = this_monday - 7 * (cutoff_days // 7 + n)
+        edges = first + 7 * np.arange(n + 1)
+    elif period == "month":
+        first = today.astype("datetime64[M]") - (cutoff_days // 30 + n)
+        edges = (first + np.arange(n + 1)).astype("datetime64[D]")
+    else:
+        raise ValueError("period must be 'day', 'week', or 'month'")
+
+    edges = edges.astype("datetime64[ns]")
+    edges.setflags(write=False)
+    return edges
+
+def grid(period: str, n: int = 30, cutoff_days: int = 0, as_of: datetime | None = None) -> np.ndarray:
+    """`n + 1` bucket edges (UTC, ``datetime64[ns]``); bucket i is [edges[i], edges[i + 1])."""
+    moment = as_of or run_as_of()
+    today = np.datetime64(moment.astimezone(timezone.utc).date(), "D")
+    return _edges(period, n, cutoff_days, today)
+
+def grid_index(period: str, n: int = 30, cutoff_days: int = 0, as_of: datetime | None = None) -> pd.DatetimeIndex:
+    """The edges of `grid` as a tz‑aware (UTC) index."""
+    return pd.DatetimeIndex(grid(period, n, cutoff_days, as_of)).tz_localize("UTC")
+
+def get_periods(period: str = "day", n: int = 30, cutoff_days: int = 0,
+                as_of: datetime | None = None) -> list[tuple[date, date]]:
+    """The buckets of `grid` as (start, end) dates, end exclusive."""
+    days = grid(period, n, cutoff_days, as_of).astype("datetime64[D]").tolist()
+    return list(zip(days[:-1], days[1:]))
+
+def period_ends(period: str, n: int = 30, cutoff_days: int = 0, as_of: datetime | None = None) -> list[datetime]:
+    """Last instant (…23:59:59.999999 UTC) of every bucket, for `<= point` sampling."""
+    return (grid_index(period, n, cutoff_days, as_of)[1:] - timedelta(microseconds=1)).to_pydatetime().tolist()
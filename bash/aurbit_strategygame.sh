@@ -43,12 +43,11 @@ git pull --ff-only origin main || echo "⚠️  Git pull skipped"
 ###############################################################################
 # 5️⃣  Run extraction & processing
 ###############################################################################
-python backend/functions/issueExtractor.py aurbit strategy-game "$API_KEY"
-python backend/functions/pullRequestExtractor.py aurbit strategy-game "$API_KEY"
+python backend/functions/issueExtractor.py aurbit strategy-game "$API_KEY" --incremental
+python backend/functions/pullRequestExtractor.py aurbit strategy-game "$API_KEY" --incremental
 python backend/functions/milestoneExtractor.py aurbit strategy-game "$API_KEY"
 
-python backend/functions/productivityISProcessing.py aurbit strategy-game
-python backend/functions/productivityPRProcessing.py aurbit strategy-game
+python backend/functions/pipeline.py aurbit strategy-game
 
 ###############################################################################
 # 6️⃣  Commit any generated metrics
@@ -43,12 +43,11 @@ git pull --ff-only origin main || echo "⚠️  Git pull skipped"
 ###############################################################################
 # 5️⃣  Run extraction & processing
 ###############################################################################
-python backend/functions/issueExtractor.py JabRef jabref "$API_KEY"
-python backend/functions/pullRequestExtractor.py JabRef jabref "$API_KEY"
-python backend/functions/milestoneExtractor.py JabRef jabref "$API_KEY"
+python backend/functions/issueExtractor.py kubernetes kubernetes "$API_KEY" --incremental
+python backend/functions/pullRequestExtractor.py kubernetes kubernetes "$API_KEY" --incremental
+python backend/functions/milestoneExtractor.py kubernetes kubernetes "$API_KEY"
 
-python backend/functions/productivityISProcessing.py JabRef jabref
-python backend/functions/productivityPRProcessing.py JabRef jabref
+python backend/functions/pipeline.py kubernetes kubernetes
 
 ###############################################################################
 # 6️⃣  Commit any generated metrics
@@ -43,12 +43,11 @@ git pull --ff-only origin main || echo "⚠️  Git pull skipped"
 ###############################################################################
 # 5️⃣  Run extraction & processing
 ###############################################################################
-python backend/functions/issueExtractor.py matplotlib matplotlib "$API_KEY"
-python backend/functions/pullRequestExtractor.py matplotlib matplotlib "$API_KEY"
+python backend/functions/issueExtractor.py matplotlib matplotlib "$API_KEY" --incremental
+python backend/functions/pullRequestExtractor.py matplotlib matplotlib "$API_KEY" --incremental
 python backend/functions/milestoneExtractor.py matplotlib matplotlib "$API_KEY"
 
-python backend/functions/productivityISProcessing.py matplotlib matplotlib
-python backend/functions/productivityPRProcessing.py matplotlib matplotlib
+python backend/functions/pipeline.py matplotlib matplotlib
 
 ###############################################################################
 # 6️⃣  Commit any generated metrics
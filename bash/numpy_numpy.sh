@@ -43,12 +43,11 @@ git pull --ff-only origin main || echo "⚠️  Git pull skipped"
 ###############################################################################
 # 5️⃣  Run extraction & processing
 ###############################################################################
-python backend/functions/issueExtractor.py numpy numpy "$API_KEY"
-python backend/functions/pullRequestExtractor.py numpy numpy "$API_KEY"
+python backend/functions/issueExtractor.py numpy numpy "$API_KEY" --incremental
+python backend/functions/pullRequestExtractor.py numpy numpy "$API_KEY" --incremental
 python backend/functions/milestoneExtractor.py numpy numpy "$API_KEY"
 
-python backend/functions/productivityISProcessing.py numpy numpy
-python backend/functions/productivityPRProcessing.py numpy numpy
+python backend/functions/pipeline.py numpy numpy
 
 ###############################################################################
 # 6️⃣  Commit any generated metrics
@@ -43,12 +43,11 @@ git pull --ff-only origin main || echo "⚠️  Git pull skipped"
 ###############################################################################
 # 5️⃣  Run extraction & processing
 ###############################################################################
-python backend/functions/issueExtractor.py pandas-dev pandas "$API_KEY"
-python backend/functions/pullRequestExtractor.py pandas-dev pandas "$API_KEY"
+python backend/functions/issueExtractor.py pandas-dev pandas "$API_KEY" --incremental
+python backend/functions/pullRequestExtractor.py pandas-dev pandas "$API_KEY" --incremental
 python backend/functions/milestoneExtractor.py pandas-dev pandas "$API_KEY"
 
-python backend/functions/productivityISProcessing.py pandas-dev pandas
-python backend/functions/productivityPRProcessing.py pandas-dev pandas
+python backend/functions/pipeline.py pandas-dev pandas
 
 ###############################################################################
 # 6️⃣  Commit any generated metrics
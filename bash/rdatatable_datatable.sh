@@ -43,13 +43,11 @@ git pull --ff-only origin main || echo "⚠️  Git pull skipped"
 ###############################################################################
 # 5️⃣  Run extraction & processing
 ###############################################################################
-python backend/functions/issueExtractor.py Rdatatable data.table "$API_KEY"
-python backend/functions/pullRequestExtractor.py Rdatatable data.table "$API_KEY"
+python backend/functions/issueExtractor.py Rdatatable data.table "$API_KEY" --incremental
+python backend/functions/pullRequestExtractor.py Rdatatable data.table "$API_KEY" --incremental
 python backend/functions/milestoneExtractor.py Rdatatable data.table "$API_KEY"
 
-python backend/functions/productivityISProcessing.py Rdatatable data.table
-python backend/functions/productivityPRProcessing.py Rdatatable data.table
-python backend/functions/newcomersProcessing.py Rdatatable data.table
+python backend/functions/pipeline.py Rdatatable data.table
 
 ###############################################################################
 # 6️⃣  Commit any generated metrics
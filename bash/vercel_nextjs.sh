@@ -43,12 +43,11 @@ git pull --ff-only origin main || echo "⚠️  Git pull skipped"
 ###############################################################################
 # 5️⃣  Run extraction & processing
 ###############################################################################
-python backend/functions/issueExtractor.py vercel next.js "$API_KEY"
-python backend/functions/pullRequestExtractor.py vercel next.js "$API_KEY"
+python backend/functions/issueExtractor.py vercel next.js "$API_KEY" --incremental
+python backend/functions/pullRequestExtractor.py vercel next.js "$API_KEY" --incremental
 python backend/functions/milestoneExtractor.py vercel next.js "$API_KEY"
 
-python backend/functions/productivityISProcessing.py vercel next.js
-python backend/functions/productivityPRProcessing.py vercel next.js
+python backend/functions/pipeline.py vercel next.js
 
 ###############################################################################
 # 6️⃣  Commit any generated metrics